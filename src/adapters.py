@@ -0,0 +1,136 @@
+import random
+from threading import Lock
+import time
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from constants import DEFAULT_POOL_SIZE, RETRY_STATUSES
+
+
+class JitterRetry(Retry):
+    """
+    Повтор запросов с экспоненциальной задержкой и полным разбросом:
+    пауза выбирается случайно от нуля до очередной задержки, чтобы
+    потоки не повторяли запросы одновременно. Заголовок Retry-After
+    ответов 413, 429 и 503 имеет приоритет над задержкой.
+    Повторы идут внутри urllib3 мимо адаптера, поэтому перед каждым
+    из них токен берётся из rate_limiter для хоста пула соединений.
+    """
+
+    def __init__(self, *args, rate_limiter=None, **kwargs):
+        self.rate_limiter = rate_limiter
+        self.host = None
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs):
+        kwargs.setdefault('rate_limiter', self.rate_limiter)
+        return super().new(**kwargs)
+
+    def increment(self, *args, **kwargs):
+        retry = super().increment(*args, **kwargs)
+        retry.host = getattr(kwargs.get('_pool'), 'host', None)
+        return retry
+
+    def get_backoff_time(self):
+        return random.uniform(0, super().get_backoff_time())
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.rate_limiter is not None and self.host is not None:
+            self.rate_limiter.acquire_host(self.host)
+
+
+class TokenBucket:
+    """
+    Ведро токенов: rate запросов в секунду, не больше capacity подряд.
+    Токен резервируется сразу, поэтому потоки ждут в порядке очереди.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = max(1.0, rate) if capacity is None else capacity
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def acquire(self):
+        """Метод забирает токен, при необходимости дожидаясь его."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated) * self.rate,
+            )
+            self.updated = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HostRateLimiter:
+    """Отдельное ведро токенов на каждый хост."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.buckets = {}
+        self.lock = Lock()
+
+    def acquire(self, url):
+        self.acquire_host(urlparse(url).hostname)
+
+    def acquire_host(self, host):
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate)
+        bucket.acquire()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    Адаптер requests, ограничивающий частоту запросов к каждому хосту.
+    Ответы из кеша до адаптера не доходят и лимит не расходуют.
+    rate_limiter - HostRateLimiter, общий с повторами JitterRetry.
+    timeout - пара (подключение, чтение) для запросов без своего тайм-аута.
+    """
+
+    def __init__(self, rate_limiter=None, timeout=None, **kwargs):
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, *args, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(request.url)
+        return super().send(request, *args, **kwargs)
+
+
+def make_adapter(
+    retries,
+    backoff,
+    rate_limit=None,
+    pool_size=DEFAULT_POOL_SIZE,
+    timeout=None,
+):
+    """
+    Метод создаёт адаптер с повторами запросов, лимитом частоты,
+    пулом из pool_size соединений на хост и тайм-аутами по умолчанию.
+    """
+    rate_limiter = None if rate_limit is None else HostRateLimiter(rate_limit)
+    return RateLimitedAdapter(
+        rate_limiter=rate_limiter,
+        timeout=timeout,
+        pool_maxsize=pool_size,
+        max_retries=JitterRetry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            rate_limiter=rate_limiter,
+        ),
+    )
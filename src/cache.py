@@ -0,0 +1,179 @@
+from collections import defaultdict
+from functools import partial
+import gzip
+from urllib.parse import urlparse
+import zlib
+
+from constants import (
+    CACHE_COMPRESSION_GZIP,
+    CACHE_COMPRESSION_LEVELS,
+    CACHE_COMPRESSION_ZSTD,
+)
+from exceptions import ParserException
+
+CACHE_STATS_FIELD_NAMES = (
+    'Хост', 'Ответов', 'Просрочено', 'Тело, байт', 'В кеше, байт',
+)
+CACHE_VACUUM_FIELD_NAMES = ('Показатель', 'Значение')
+DECOMPRESS_MESSAGE_ERROR = 'Запись кеша не распаковывается: {error}'
+NO_CACHE_MESSAGE_ERROR = (
+    'У сессии нет кеша ответов: режимы кеша не работают с --replay'
+)
+UNREADABLE_HOST = 'Не читаются'
+
+
+def get_compression_stage(codec, level=None):
+    """Метод возвращает функции сжатия и распаковки для кодека codec."""
+    if level is None:
+        level = CACHE_COMPRESSION_LEVELS[codec]
+    if codec == CACHE_COMPRESSION_ZSTD:
+        import zstandard
+
+        return partial(zstandard.compress, level=level), partial(
+            decompress_entry, zstandard.decompress, zstandard.ZstdError,
+        )
+    compress = partial(gzip.compress, compresslevel=level, mtime=0)
+    return compress, partial(
+        decompress_entry, gzip.decompress, (OSError, EOFError, zlib.error),
+    )
+
+
+def decompress_entry(decompress, errors, data):
+    """
+    Метод распаковывает запись кеша. Запись, сохранённая без сжатия
+    или другим кодеком, вызывает ValueError: requests_cache считает её
+    нечитаемой и загружает ответ заново, а не падает.
+    """
+    try:
+        return decompress(data)
+    except errors as error:
+        raise ValueError(DECOMPRESS_MESSAGE_ERROR.format(error=error))
+
+
+def make_serializer(codec=CACHE_COMPRESSION_GZIP, level=None):
+    """
+    Метод создаёт сериализатор requests_cache, который после pickle
+    сжимает ответ кодеком codec с уровнем level.
+    """
+    from requests_cache.serializers import (
+        SerializerPipeline,
+        Stage,
+        pickle_serializer,
+    )
+
+    compress, decompress = get_compression_stage(codec, level)
+    return SerializerPipeline(
+        [
+            *pickle_serializer.stages,
+            Stage(dumps=compress, loads=decompress),
+        ],
+        name=f'pickle_{codec}',
+        is_binary=True,
+    )
+
+
+def get_cache_size(cache):
+    """Метод возвращает размер файлов кеша на диске в байтах."""
+    db_path = getattr(cache, 'db_path', None)
+    if db_path is not None:
+        return sum(
+            path.stat().st_size
+            for path in (db_path, db_path.with_name(db_path.name + '-wal'))
+            if path.exists()
+        )
+    cache_dir = getattr(cache, 'cache_dir', None)
+    if cache_dir is not None:
+        return sum(
+            path.stat().st_size
+            for path in cache_dir.rglob('*') if path.is_file()
+        )
+    return 0
+
+
+def get_stored_sizes(responses):
+    """
+    Метод возвращает размеры записей в хранилище по ключам,
+    не распаковывая их: length(value) в SQLite, размер файла в папке.
+    Для кеша в памяти возвращает пустой словарь.
+    """
+    table_name = getattr(responses, 'table_name', None)
+    if table_name is not None:
+        with responses.connection() as connection:
+            return dict(connection.execute(
+                f'SELECT key, length(value) FROM {table_name}',
+            ))
+    if hasattr(responses, 'paths'):
+        return {path.stem: path.stat().st_size for path in responses.paths()}
+    return {}
+
+
+def get_session_cache(session):
+    """Метод возвращает кеш ответов сессии, у записи с --replay его нет."""
+    cache = getattr(session, 'cache', None)
+    if cache is None:
+        raise ParserException(NO_CACHE_MESSAGE_ERROR)
+    return cache
+
+
+def cache_stats(session, *args):
+    """
+    Метод возвращает количество и размер ответов в кеше по хостам:
+    сколько весят тела ответов и сколько они занимают в кеше.
+    Записи, которые не читаются текущим сериализатором, собраны
+    в отдельную строку.
+    """
+    responses = get_session_cache(session).responses
+    stored_sizes = get_stored_sizes(responses)
+    hosts = defaultdict(lambda: [0, 0, 0, 0])
+    for key in list(responses.keys()):
+        try:
+            response = responses[key]
+        except KeyError:
+            continue
+        if response is None:
+            host = hosts[UNREADABLE_HOST]
+        else:
+            host = hosts[urlparse(response.url).netloc]
+            host[1] += response.is_expired
+            host[2] += len(response.content)
+        host[0] += 1
+        host[3] += stored_sizes.get(
+            key, 0 if response is None else len(response.content),
+        )
+    rows = sorted(
+        ((name, *host) for name, host in hosts.items()),
+        key=lambda row: row[-1],
+        reverse=True,
+    )
+    return [
+        CACHE_STATS_FIELD_NAMES,
+        *rows,
+        ('Всего', *(sum(column) for column in zip(*hosts.values()))),
+    ] if rows else [CACHE_STATS_FIELD_NAMES]
+
+
+def cache_vacuum(session, *args):
+    """
+    Метод удаляет из кеша просроченные ответы и записи, которые
+    не читаются текущим сериализатором, затем сжимает файл кеша.
+    Возвращает число удалённых ответов и размер кеша до и после.
+    """
+    cache = get_session_cache(session)
+    size_before = get_cache_size(cache)
+    count_before = len(cache.responses)
+    cache.delete(expired=True, invalid=True)
+    vacuum = getattr(cache.responses, 'vacuum', None)
+    if vacuum is not None:
+        vacuum()
+        # В режиме WAL место освобождается только после переноса журнала.
+        with cache.responses.connection() as connection:
+            connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return [
+        CACHE_VACUUM_FIELD_NAMES,
+        (
+            'Удалено просроченных и нечитаемых ответов',
+            count_before - len(cache.responses),
+        ),
+        ('Размер до, байт', size_before),
+        ('Размер после, байт', get_cache_size(cache)),
+    ]
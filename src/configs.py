@@ -1,15 +1,98 @@
 import argparse
+from importlib.util import find_spec
 import logging
 from logging.handlers import RotatingFileHandler
+from pathlib import Path
 
 from constants import (
+    BASE_DIR,
+    CACHE_BACKEND_FILESYSTEM,
+    CACHE_BACKEND_MEMORY,
+    CACHE_BACKEND_SQLITE,
+    CACHE_COMPRESSION_GZIP,
+    CACHE_COMPRESSION_NONE,
+    CACHE_COMPRESSION_ZSTD,
+    CACHE_EXCLUDE,
+    CACHE_NAME,
     DATETIME_FORMAT,
+    DEFAULT_BACKOFF,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_PARSED_CACHE_SIZE,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_REFRESH_INTERVAL,
+    DEFAULT_SERVE_HOST,
+    DEFAULT_SERVE_PORT,
+    DEFAULT_RETRIES,
+    DEFAULT_WORKERS,
     LOG_DIR,
     LOG_FORMAT,
+    OUTPUT_COLUMNAR,
     OUTPUT_FILE,
+    OUTPUT_JSONL,
     OUTPUT_PRETTY,
+    PROFILE_CPU,
+    PROFILE_MEM,
+    URLS_EXPIRE_AFTER,
 )
 
+EXPIRE_AFTER_MESSAGE_ERROR = (
+    'Ожидается шаблон ссылки и время в секундах через "=": {value}'
+)
+NON_NEGATIVE_INT_MESSAGE_ERROR = (
+    'Ожидается целое число не меньше нуля: {value}'
+)
+POSITIVE_FLOAT_MESSAGE_ERROR = 'Ожидается число больше нуля: {value}'
+POSITIVE_INT_MESSAGE_ERROR = 'Ожидается целое число больше нуля: {value}'
+SHARD_MESSAGE_ERROR = 'Ожидается номер шарда и их число: I/N, 1 <= I <= N'
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            POSITIVE_INT_MESSAGE_ERROR.format(value=value),
+        )
+    return number
+
+
+def non_negative_int(value):
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(
+            NON_NEGATIVE_INT_MESSAGE_ERROR.format(value=value),
+        )
+    return number
+
+
+def positive_float(value):
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(
+            POSITIVE_FLOAT_MESSAGE_ERROR.format(value=value),
+        )
+    return number
+
+
+def shard(value):
+    index, _, count = value.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(SHARD_MESSAGE_ERROR)
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(SHARD_MESSAGE_ERROR)
+    return index, count
+
+
+def expire_after(value):
+    pattern, _, seconds = value.rpartition('=')
+    try:
+        return pattern, int(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            EXPIRE_AFTER_MESSAGE_ERROR.format(value=value),
+        )
+
 
 def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description='Парсер документации Python')
@@ -17,6 +100,7 @@ def configure_argument_parser(available_modes):
         'mode',
         help='Режимы работы парсера',
         choices=available_modes,
+        nargs='+',
     )
     parser.add_argument(
         '-c',
@@ -27,12 +111,315 @@ def configure_argument_parser(available_modes):
     parser.add_argument(
         '-o',
         '--output',
-        choices=(OUTPUT_PRETTY, OUTPUT_FILE),
+        choices=(OUTPUT_PRETTY, OUTPUT_FILE, OUTPUT_JSONL, OUTPUT_COLUMNAR),
         help='Дополнительные способы вывода данных',
     )
+    parser.add_argument(
+        '-s',
+        '--stream',
+        help='Выводить строки по мере получения, без накопления в памяти',
+        action='store_true',
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help='Количество потоков для загрузки страниц',
+    )
+    parser.add_argument(
+        '-p',
+        '--processes',
+        type=positive_int,
+        help=(
+            'Разбирать страницы в пуле из PROCESSES процессов; '
+            '--workers поднимается до PROCESSES, чтобы пул был загружен'
+        ),
+    )
+    parser.add_argument(
+        '--detailed',
+        help=(
+            'Режим pep: строка на каждый PEP с номером, ссылкой, типом '
+            'и статусами вместо количества по статусам'
+        ),
+        action='store_true',
+    )
+    parser.add_argument(
+        '--shard',
+        type=shard,
+        metavar='I/N',
+        help=(
+            'Режим pep: обработать только шард I из N по crc32 номера PEP '
+            'и сохранить частичный результат для режима merge'
+        ),
+    )
+    parser.add_argument(
+        '--checkpoint',
+        help=(
+            'Режимы pep и whats-new: записывать обработанные ссылки '
+            'в журнал, чтобы прерванный запуск можно было продолжить'
+        ),
+        action='store_true',
+    )
+    parser.add_argument(
+        '--resume',
+        help=(
+            'Продолжить прерванный запуск с --checkpoint: ссылки из журнала '
+            'не загружаются повторно'
+        ),
+        action='store_true',
+    )
+    parser.add_argument(
+        '--fast-status',
+        help='Быстрое извлечение статуса PEP через XPath lxml',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--revalidate',
+        help=(
+            'Проверять актуальность кеша запросами '
+            'с If-None-Match/If-Modified-Since'
+        ),
+        action='store_true',
+    )
+    parser.add_argument(
+        '--incremental',
+        help='Разбирать заново только изменившиеся страницы PEP',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--memoize',
+        help='Сохранять разобранные значения страниц по хешу их содержимого',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--memo-size',
+        type=positive_int,
+        default=DEFAULT_PARSED_CACHE_SIZE,
+        help='Максимум записей в кеше разобранных значений',
+    )
+    parser.add_argument(
+        '--cache-backend',
+        choices=(
+            CACHE_BACKEND_SQLITE,
+            CACHE_BACKEND_FILESYSTEM,
+            CACHE_BACKEND_MEMORY,
+        ),
+        default=CACHE_BACKEND_SQLITE,
+        help='Хранилище кеша HTTP-ответов',
+    )
+    parser.add_argument(
+        '--cache-name',
+        default=CACHE_NAME,
+        help='Имя файла или папки кеша HTTP-ответов',
+    )
+    parser.add_argument(
+        '--cache-compression',
+        choices=(
+            CACHE_COMPRESSION_GZIP,
+            CACHE_COMPRESSION_NONE,
+            *(
+                (CACHE_COMPRESSION_ZSTD,)
+                if find_spec('zstandard') is not None else ()
+            ),
+        ),
+        default=CACHE_COMPRESSION_GZIP,
+        help=(
+            'Сжатие ответов в кеше sqlite и filesystem; zstd доступен '
+            'при установленном zstandard (по умолчанию %(default)s)'
+        ),
+    )
+    parser.add_argument(
+        '--cache-compression-level',
+        type=int,
+        metavar='LEVEL',
+        help='Уровень сжатия, по умолчанию 6 для gzip и 3 для zstd',
+    )
+    parser.add_argument(
+        '--expire-after',
+        type=expire_after,
+        action='append',
+        default=[],
+        metavar='PATTERN=SECONDS',
+        help=(
+            'Время жизни кеша для ссылок по шаблону, -1 - бессрочно; '
+            'дополняет и переопределяет URLS_EXPIRE_AFTER'
+        ),
+    )
+    parser.add_argument(
+        '--cache-exclude',
+        action='append',
+        default=[],
+        metavar='PATTERN',
+        help='Шаблон ссылок, ответы на которые не кешируются',
+    )
+    parser.add_argument(
+        '--retries',
+        type=non_negative_int,
+        default=DEFAULT_RETRIES,
+        help=(
+            'Сколько раз повторять запрос при ошибке сети или ответе 429/5xx '
+            '(по умолчанию %(default)s)'
+        ),
+    )
+    parser.add_argument(
+        '--backoff',
+        type=float,
+        default=DEFAULT_BACKOFF,
+        help=(
+            'Начальная задержка повтора в секундах, удваивается с каждой '
+            'попыткой; Retry-After сервера имеет приоритет '
+            '(по умолчанию %(default)s)'
+        ),
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=positive_float,
+        metavar='RPS',
+        help='Не больше RPS запросов в секунду к одному хосту на все потоки',
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=positive_int,
+        help=(
+            'Соединений keep-alive в пуле на один хост, '
+            'по умолчанию равно --workers'
+        ),
+    )
+    parser.add_argument(
+        '--connect-timeout',
+        type=positive_float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help='Тайм-аут подключения в секундах (по умолчанию %(default)s)',
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=positive_float,
+        default=DEFAULT_READ_TIMEOUT,
+        help='Тайм-аут чтения ответа в секундах (по умолчанию %(default)s)',
+    )
+    parser.add_argument(
+        '--accept-encoding',
+        help=(
+            'Заголовок Accept-Encoding, по умолчанию gzip и deflate, '
+            'а также br при установленном brotli'
+        ),
+    )
+    parser.add_argument(
+        '--host',
+        default=DEFAULT_SERVE_HOST,
+        help='Адрес HTTP-сервера режима serve (по умолчанию %(default)s)',
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=DEFAULT_SERVE_PORT,
+        help='Порт HTTP-сервера режима serve (по умолчанию %(default)s)',
+    )
+    parser.add_argument(
+        '--refresh-interval',
+        type=positive_float,
+        default=DEFAULT_REFRESH_INTERVAL,
+        metavar='SECONDS',
+        help=(
+            'Как часто режим serve обновляет результаты в фоне '
+            '(по умолчанию %(default)s)'
+        ),
+    )
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument(
+        '--record',
+        type=Path,
+        metavar='DIR',
+        help='Сохранять полученные ответы в сжатом виде в папку DIR',
+    )
+    replay_group.add_argument(
+        '--replay',
+        type=Path,
+        metavar='DIR',
+        help=(
+            'Отдавать ответы только из записи в папке DIR, без сети; '
+            'отсутствующий ответ прерывает режим'
+        ),
+    )
+    parser.add_argument(
+        '--metrics-file',
+        metavar='PATH',
+        help=(
+            'Сохранить в JSON замеры по каждой ссылке: время загрузки, '
+            'кеш, байты и время разбора'
+        ),
+    )
+    parser.add_argument(
+        '--profile',
+        choices=(PROFILE_CPU, PROFILE_MEM),
+        help=(
+            'Профилировать каждый режим через cProfile или tracemalloc, '
+            'отчёт и файл pstats или collapsed-стеки сохраняются в results'
+        ),
+    )
     return parser
 
 
+def configure_session(cli_args):
+    """
+    Метод создаёт сессию с кешем по настройкам из cli_args.
+    С --replay сессия отдаёт ответы из записи, с --record - записывает их.
+    """
+    if cli_args.replay is not None:
+        from replay import ReplaySession, ResponseArchive
+
+        return ReplaySession(ResponseArchive(cli_args.replay))
+
+    import requests_cache
+
+    from adapters import make_adapter
+
+    urls_expire_after = {
+        pattern: requests_cache.DO_NOT_CACHE
+        for pattern in (*cli_args.cache_exclude, *CACHE_EXCLUDE)
+    }
+    for pattern, seconds in (
+        *cli_args.expire_after, *URLS_EXPIRE_AFTER.items(),
+    ):
+        urls_expire_after.setdefault(pattern, seconds)
+    backend_options = {}
+    if cli_args.cache_backend == CACHE_BACKEND_SQLITE:
+        backend_options['wal'] = True
+    if (
+        cli_args.cache_backend != CACHE_BACKEND_MEMORY
+        and cli_args.cache_compression != CACHE_COMPRESSION_NONE
+    ):
+        from cache import make_serializer
+
+        backend_options['serializer'] = make_serializer(
+            cli_args.cache_compression, cli_args.cache_compression_level,
+        )
+    session = requests_cache.CachedSession(
+        str(BASE_DIR / cli_args.cache_name),
+        backend=cli_args.cache_backend,
+        urls_expire_after=urls_expire_after,
+        always_revalidate=cli_args.revalidate,
+        **backend_options,
+    )
+    if cli_args.accept_encoding is not None:
+        session.headers['Accept-Encoding'] = cli_args.accept_encoding
+    adapter = make_adapter(
+        cli_args.retries,
+        cli_args.backoff,
+        cli_args.rate_limit,
+        pool_size=cli_args.pool_size or cli_args.workers,
+        timeout=(cli_args.connect_timeout, cli_args.read_timeout),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if cli_args.record is not None:
+        from replay import RecordingSession, ResponseArchive
+
+        return RecordingSession(session, ResponseArchive(cli_args.record))
+    return session
+
+
 def configure_logging():
     LOG_DIR.mkdir(exist_ok=True)
     logging.basicConfig(
@@ -2,10 +2,38 @@ from pathlib import Path
 
 
 BASE_DIR = Path('__file__').parent
+CACHE_BACKEND_FILESYSTEM = 'filesystem'
+CACHE_BACKEND_MEMORY = 'memory'
+CACHE_BACKEND_SQLITE = 'sqlite'
+CACHE_COMPRESSION_GZIP = 'gzip'
+CACHE_COMPRESSION_NONE = 'none'
+CACHE_COMPRESSION_ZSTD = 'zstd'
+# Уровень сжатия тел ответов в кеше по умолчанию для каждого кодека.
+CACHE_COMPRESSION_LEVELS = {
+    CACHE_COMPRESSION_GZIP: 6,
+    CACHE_COMPRESSION_ZSTD: 3,
+}
+CACHE_EXCLUDE = ('*.zip',)
+CACHE_NAME = 'http_cache'
+COLUMNAR_BATCH_SIZE = 1024
+OUTPUT_COLUMNAR = 'columnar'
 OUTPUT_FILE = 'file'
+OUTPUT_JSONL = 'jsonl'
 OUTPUT_PRETTY = 'pretty'
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
+DEFAULT_BACKOFF = 0.5
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_PARSED_CACHE_SIZE = 10_000
+DEFAULT_POOL_SIZE = 10
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_REFRESH_INTERVAL = 60 * 60
+DEFAULT_SERVE_HOST = '127.0.0.1'
+DEFAULT_SERVE_PORT = 8000
+DEFAULT_RETRIES = 3
+DEFAULT_WORKERS = 1
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 DOWNLOAD_DIR = 'downloads'
+DOWNLOAD_PART_SUFFIX = '.part'
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
     'D': ('Deferred',),
@@ -16,9 +44,39 @@ EXPECTED_STATUS = {
     'W': ('Withdrawn',),
     '': ('Draft', 'Active'),
 }
+JOURNAL_FILE = '{mode}.journal.jsonl'
 LOG_DIR = BASE_DIR / 'logs'
 LOG_FORMAT = '%(asctime)s - [%(levelname)s] - %(message)s'
 MAIN_DOC_URL = 'https://docs.python.org/3/'
+MODE_ALL = 'all'
+MODE_CACHE_STATS = 'cache-stats'
+MODE_CACHE_VACUUM = 'cache-vacuum'
+MODE_MERGE = 'merge'
+MODE_SERVE = 'serve'
+PARSED_CACHE_FILE = 'parsed.sqlite'
+# Версия разбора страниц: увеличивается при изменении извлечения значений,
+# чтобы не брать из состояния и кеша значения, разобранные по-старому.
+PARSER_VERSION = 1
 PEP_URL = 'https://peps.python.org/'
 PEP_LIST_URL = 'https://peps.python.org/numerical/'
+PEP_STATE_FILE = 'pep.json'
+PROFILE_CPU = 'cpu'
+PROFILE_MEM = 'mem'
+# Глубина стеков tracemalloc и число строк в текстовых отчётах профиля.
+PROFILE_STACK_DEPTH = 32
+PROFILE_TOP = 50
+RECORD_SUFFIX = '.response.gz'
 RESULTS_DIR = 'results'
+# Ответы, после которых запрос повторяется с задержкой.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+SHARD_FILE = 'pep_{index}_of_{count}.json'
+SHARDS_DIR = 'shards'
+STATE_DIR = 'state'
+# Время жизни кеша в секундах по шаблонам ссылок, -1 - бессрочно.
+URLS_EXPIRE_AFTER = {
+    'peps.python.org/numerical/': 60 * 60,
+    'peps.python.org/pep-*': 7 * 24 * 60 * 60,
+    'docs.python.org/3/whatsnew/': 24 * 60 * 60,
+    'docs.python.org/3/download.html': 24 * 60 * 60,
+    'docs.python.org/3/': 60 * 60,
+}
@@ -8,3 +8,15 @@ class ParserFindTagException(Exception):
 
 class ParserFindUrlException(Exception):
     """Вызывается, когда парсер не может найти ссылку."""
+
+
+class ParserDownloadException(ParserException):
+    """Вызывается, когда скачанный файл не прошёл проверку."""
+
+
+class ParserMergeException(ParserException):
+    """Вызывается, когда частичные результаты шардов нельзя объединить."""
+
+
+class ParserReplayException(ParserException):
+    """Вызывается, когда ответа нет в записи для воспроизведения."""
@@ -1,28 +1,82 @@
+from argparse import Namespace
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager, nullcontext
+from functools import partial, wraps
+import heapq
 import logging
+from operator import attrgetter, itemgetter
 import re
+from threading import Lock
 from urllib.parse import urljoin
 
-import requests_cache
-from tqdm import tqdm
-
-from configs import configure_argument_parser, configure_logging
+from cache import cache_stats, cache_vacuum
+from configs import (
+    configure_argument_parser,
+    configure_logging,
+    configure_session,
+)
 from constants import (
     BASE_DIR,
+    DEFAULT_PARSED_CACHE_SIZE,
+    DEFAULT_WORKERS,
     DOWNLOAD_DIR,
     EXPECTED_STATUS,
+    JOURNAL_FILE,
     MAIN_DOC_URL,
+    MODE_ALL,
+    MODE_CACHE_STATS,
+    MODE_CACHE_VACUUM,
+    MODE_MERGE,
+    MODE_SERVE,
+    OUTPUT_PRETTY,
+    PARSED_CACHE_FILE,
+    PARSER_VERSION,
     PEP_LIST_URL,
+    PEP_STATE_FILE,
     PEP_URL,
+    SHARDS_DIR,
+    STATE_DIR,
+)
+from exceptions import (
+    ParserException,
+    ParserFindTagException,
+    ParserFindUrlException,
 )
-from exceptions import ParserException, ParserFindUrlException
+from metrics import METRICS, PHASE_OUTPUT, get_metrics, mode_metrics
 from outputs import control_output
-from utils import find_tag, get_soup
+from profiling import profile_mode
+from records import PEP_FIELD_NAMES, PepRecord
+from shards import in_shard, load_shards, write_shard
+from storage import (
+    Journal,
+    ParsedCache,
+    get_content_hash,
+    load_state,
+    save_state,
+)
+from utils import (
+    RESPONSE_CACHED,
+    RESPONSE_COUNTS,
+    RESPONSE_DOWNLOADED,
+    RESPONSE_REVALIDATED,
+    check_archive,
+    concurrent_map,
+    download_file,
+    find_tag,
+    get_field_value,
+    get_response,
+    get_soup,
+    make_soup,
+)
 
 CONNECTION_MESSAGE_ERROR = 'Не удается подключиться к {url}, ошибка: {error}'
-DOWNLOAD_MESSAGE_INFO = 'Архив был загружен и сохранён: {archive_path}'
+DOWNLOAD_MESSAGE_INFO = (
+    'Архив был загружен и сохранён: {archive_path}, sha256: {checksum}'
+)
 END_LOG_INFO = 'Парсер завершил работу.'
 PARSER_LOG_ERROR = 'Работа парсера вызвала ошибку: {error}'
+MODE_LOG_ERROR = 'Режим {mode} завершился ошибкой: {error}'
 PEP_LOG_INFO = (
     '{tr_link}\n'
     'Статус в карточке: {pep_status}\n'
@@ -30,9 +84,32 @@ PEP_LOG_INFO = (
     '{tr_status}'
 )
 MAIN_LOG_INFO = 'Аргументы командной строки {args}'
+REVALIDATE_LOG_INFO = (
+    'Подтверждено сервером (304): {revalidated}, '
+    'скачано заново: {downloaded}, взято из кеша: {cached}'
+)
 MESSAGE_ERROR = 'Ничего не нашлось'
 START_LOG_INFO = 'Парсер запущен!'
 
+# Аргументы SoupStrainer: каждый режим строит суп только из нужных тегов.
+# SoupStrainer сверяет class целой строкой, до разбиения на отдельные
+# классы, поэтому класс ищется регулярным выражением.
+CLASS_PATTERN = r'(?:^|\s){}(?:\s|$)'
+WHATS_NEW_LIST_PARSE_ONLY = {'attrs': {'id': 'what-s-new-in-python'}}
+WHATS_NEW_PARSE_ONLY = {'name': ['h1', 'dl']}
+LATEST_VERSIONS_PARSE_ONLY = {
+    'name': 'div',
+    'attrs': {
+        'class': re.compile(CLASS_PATTERN.format('sphinxsidebarwrapper')),
+    },
+}
+DOWNLOAD_PARSE_ONLY = {
+    'name': 'table',
+    'attrs': {'class': re.compile(CLASS_PATTERN.format('docutils'))},
+}
+PEP_LIST_PARSE_ONLY = {'name': 'tbody'}
+PEP_PARSE_ONLY = {'name': 'dl'}
+
 
 def get_main_status(tr_tag):
     try:
@@ -48,43 +125,287 @@ def get_single_status(soup):
     return pep_status
 
 
-def whats_new(session):
+def get_fast_status(text):
+    return get_field_value(text, 'Status:')
+
+
+def parse_pep_status(text, fast_status=False):
+    if fast_status:
+        pep_status = get_fast_status(text)
+        if pep_status is not None:
+            return pep_status
+    return get_single_status(make_soup(text, parse_only=PEP_PARSE_ONLY))
+
+
+def parse_whats_new_info(text):
+    soup = make_soup(text, parse_only=WHATS_NEW_PARSE_ONLY)
+    h1 = find_tag(soup, 'h1')
+    dl = find_tag(soup, 'dl')
+    return h1.text, dl.text.replace('\n', ' ')
+
+
+def run_parse(parse, text, parse_pool=None):
+    """
+    Метод выполняет parse в текущем потоке или в пуле процессов
+    parse_pool: туда уходит только текст страницы, обратно - извлечённые
+    значения, дерево супа между процессами не передаётся.
+    """
+    if parse_pool is None:
+        return parse(text)
+    return parse_pool.submit(parse, text).result()
+
+
+def parse_response(
+    response,
+    parse,
+    parsed_cache=None,
+    content_hash=None,
+    parse_pool=None,
+):
+    """
+    Метод разбирает страницу функцией parse.
+    parsed_cache - кеш разобранных значений по версии разбора
+    и хешу содержимого страницы.
+    """
+    with get_metrics().parsing(response.url):
+        if parsed_cache is None:
+            return run_parse(parse, response.text, parse_pool)
+        if content_hash is None:
+            content_hash = get_content_hash(response.content)
+        name = getattr(parse, 'func', parse).__name__
+        return parsed_cache.get_or_set(
+            f'{name}:{PARSER_VERSION}:{content_hash}',
+            lambda: run_parse(parse, response.text, parse_pool),
+        )
+
+
+def get_pep_status(
+    session,
+    tr_link,
+    fast_status=False,
+    pep_states=None,
+    parsed_cache=None,
+    parse_pool=None,
+):
+    """
+    Метод возвращает статус из карточки PEP.
+    pep_states - сохранённые статусы по ссылкам: если хеш страницы
+    не изменился, статус берётся оттуда без разбора HTML.
+    """
+    response = get_response(session, tr_link)
+    parse = partial(parse_pep_status, fast_status=fast_status)
+    if pep_states is None:
+        return parse_response(
+            response, parse, parsed_cache, parse_pool=parse_pool,
+        )
+    content_hash = get_content_hash(response.content)
+    saved_hash, pep_status = pep_states.get(tr_link, (None, None))
+    if saved_hash != content_hash:
+        pep_status = parse_response(
+            response, parse, parsed_cache, content_hash, parse_pool,
+        )
+        pep_states[tr_link] = (content_hash, pep_status)
+    return pep_status
+
+
+def get_pep_record(tr_tag):
+    """Метод возвращает запись PEP по строке таблицы оглавления."""
+    a_tag = find_tag(tr_tag, 'a')
+    return PepRecord(
+        int(a_tag.text),
+        urljoin(PEP_URL, a_tag['href']),
+        find_tag(tr_tag, 'abbr').text[:1],
+        get_main_status(tr_tag),
+    )
+
+
+def get_pep_records(session, pep_state=None):
+    """
+    Метод возвращает записи PEP со ссылками и ожидаемыми статусами.
+    pep_state - сохранённое состояние: если оглавление не изменилось,
+    записи берутся оттуда без разбора HTML.
+    """
+    response = get_response(session, PEP_LIST_URL)
+    if pep_state is not None:
+        content_hash = get_content_hash(response.content)
+        if pep_state.get('index_hash') == content_hash:
+            return list(map(PepRecord.from_state, pep_state['records']))
+    with get_metrics().parsing(response.url):
+        table = find_tag(
+            make_soup(response.text, parse_only=PEP_LIST_PARSE_ONLY), 'tbody',
+        )
+        records = list(map(get_pep_record, table.find_all('tr')))
+    if pep_state is not None:
+        pep_state.update(
+            index_hash=content_hash,
+            records=[record.to_state() for record in records],
+        )
+    return records
+
+
+def get_whats_new_info(
+    session, version_link, parsed_cache=None, parse_pool=None,
+):
+    return parse_response(
+        get_response(session, version_link),
+        parse_whats_new_info,
+        parsed_cache,
+        parse_pool=parse_pool,
+    )
+
+
+def open_parsed_cache(cli_args=None):
+    """Метод открывает кеш разобранных значений, если он включён."""
+    if not getattr(cli_args, 'memoize', False):
+        return nullcontext()
+    return closing(ParsedCache(
+        BASE_DIR / STATE_DIR / PARSED_CACHE_FILE,
+        getattr(cli_args, 'memo_size', DEFAULT_PARSED_CACHE_SIZE),
+    ))
+
+
+def open_parse_pool(cli_args=None):
+    """
+    Метод открывает пул процессов для разбора страниц, если он включён.
+    Процессы пула стартуют при первой задаче из потока загрузки, поэтому
+    они запускаются через forkserver или spawn, а не fork: копия процесса
+    с другими потоками могла бы унаследовать захваченные ими блокировки.
+    """
+    processes = getattr(cli_args, 'processes', None)
+    if processes is None:
+        return nullcontext()
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    start_method = (
+        'forkserver'
+        if 'forkserver' in multiprocessing.get_all_start_methods()
+        else 'spawn'
+    )
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context(start_method),
+    )
+
+
+@contextmanager
+def open_journal(cli_args, mode):
+    """
+    Метод открывает журнал обработанных ссылок режима mode,
+    если включены --checkpoint или --resume.
+    Журнал удаляется, только когда режим отработал до конца.
+    """
+    resume = getattr(cli_args, 'resume', False)
+    if not (resume or getattr(cli_args, 'checkpoint', False)):
+        yield Journal()
+        return
+    journal = Journal(
+        BASE_DIR / STATE_DIR / JOURNAL_FILE.format(mode=mode), resume,
+    )
+    try:
+        yield journal
+    finally:
+        journal.close()
+    journal.remove()
+
+
+def merge_in_order(links, restored, fetched, get_link):
+    """
+    Метод сливает восстановленные из журнала и загруженные значения
+    в порядке ссылок links. Оба потока уже упорядочены по links.
+    """
+    positions = {link: position for position, link in enumerate(links)}
+    return heapq.merge(
+        restored, fetched, key=lambda item: positions[get_link(item)],
+    )
+
+
+def fetch_all(func, session, urls, cli_args=None):
+    """Метод загружает страницы в пуле из cli_args.workers потоков."""
+    return concurrent_map(
+        partial(func, session),
+        urls,
+        workers=getattr(cli_args, 'workers', DEFAULT_WORKERS),
+    )
+
+
+def streamable(mode_function):
+    """
+    Декоратор режима-генератора строк.
+    С --stream режим отдаёт строки по мере получения, иначе список.
+    """
+    @wraps(mode_function)
+    def wrapper(session, cli_args=None):
+        rows = mode_function(session, cli_args)
+        return rows if getattr(cli_args, 'stream', False) else list(rows)
+    return wrapper
+
+
+def fetch_whats_new_rows(session, version_links, cli_args=None, journal=None):
+    """Метод загружает страницы нововведений и отдаёт строки по порядку."""
+    log_list = []
+    with open_parsed_cache(cli_args) as parsed_cache, open_parse_pool(
+        cli_args,
+    ) as parse_pool:
+        for version_link, future in fetch_all(
+            partial(
+                get_whats_new_info,
+                parsed_cache=parsed_cache,
+                parse_pool=parse_pool,
+            ),
+            session,
+            version_links,
+            cli_args,
+        ):
+            try:
+                h1_text, dl_text = future.result()
+            except ConnectionError as error:
+                log_list.append(
+                    CONNECTION_MESSAGE_ERROR.format(
+                        url=version_link, error=error,
+                    ),
+                )
+                continue
+            if journal is not None:
+                journal.add(version_link, (h1_text, dl_text))
+            yield version_link, h1_text, dl_text
+    list(map(logging.error, log_list))
+
+
+@streamable
+def whats_new(session, cli_args=None):
     """
     Метод возвращает все вышедшие новвоведения в Python.
     Ссылки, заголовки и авторов данных нововведений.
     """
     whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
-    a_tags = get_soup(session, whats_new_url).select(
+    a_tags = get_soup(
+        session, whats_new_url, parse_only=WHATS_NEW_LIST_PARSE_ONLY,
+    ).select(
         '#what-s-new-in-python div.toctree-wrapper '
         'li.toctree-l1 a[href$=".html"]',
     )
-    results = [('Ссылка на статью', 'Заголовок', 'Редактор, автор')]
-    log_list = []
-    for a_tag in tqdm(a_tags):
-        version_link = urljoin(whats_new_url, a_tag['href'])
-        try:
-            soup = get_soup(session, version_link)
-        except ConnectionError as error:
-            log_list.append(
-                CONNECTION_MESSAGE_ERROR.format(
-                    url=version_link, error=error,
-                ),
-            )
-            continue
-        h1 = find_tag(soup, 'h1')
-        dl = find_tag(soup, 'dl')
-        results.append((version_link, h1.text, dl.text.replace('\n', ' ')))
-    list(map(logging.error, log_list))
-    return results
+    yield ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
+    version_links = [urljoin(whats_new_url, a_tag['href']) for a_tag in a_tags]
+    with open_journal(cli_args, 'whats-new') as journal:
+        done_links, pending_links = journal.split(version_links)
+        yield from merge_in_order(
+            version_links,
+            [(link, *journal.entries[link]) for link in done_links],
+            fetch_whats_new_rows(session, pending_links, cli_args, journal),
+            itemgetter(0),
+        )
 
 
-def latest_versions(session):
+def latest_versions(session, *args):
     """
     Метод возвращает ссылки на документации
     каждой отдельной версии Python, также их статус.
     """
     sidebar = find_tag(
-        get_soup(session, MAIN_DOC_URL),
+        get_soup(
+            session, MAIN_DOC_URL, parse_only=LATEST_VERSIONS_PARSE_ONLY,
+        ),
         'div',
         attrs={'class': 'sphinxsidebarwrapper'},
     )
@@ -109,60 +430,210 @@ def latest_versions(session):
     return results
 
 
-def download(session):
+def download(session, *args):
     """Метод скачивает и сохраняет новейшую документацию Python."""
     downloads_url = urljoin(MAIN_DOC_URL, 'download.html')
     archive_url = urljoin(
         downloads_url,
-        get_soup(session, downloads_url).select_one(
+        get_soup(
+            session, downloads_url, parse_only=DOWNLOAD_PARSE_ONLY,
+        ).select_one(
             'table.docutils a[href$="pdf-a4.zip"]',
         )['href'],
     )
     download_dir = BASE_DIR / DOWNLOAD_DIR
     download_dir.mkdir(exist_ok=True)
 
-    response = session.get(archive_url)
     archive_path = download_dir / archive_url.split('/')[-1]
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
-    logging.info(DOWNLOAD_MESSAGE_INFO.format(archive_path=archive_path))
+    checksum = download_file(
+        session, archive_url, archive_path, check=check_archive,
+    )
+    logging.info(DOWNLOAD_MESSAGE_INFO.format(
+        archive_path=archive_path, checksum=checksum,
+    ))
 
 
-def pep(session):
-    """Метод возвращает все документы PEP, их типы и статусы."""
-    table = find_tag(get_soup(session, PEP_LIST_URL), 'tbody')
-    counts_statuses = defaultdict(int)
-    not_equals_statuses = []
+def load_pep_state(path):
+    """
+    Метод загружает состояние --incremental. Состояние другой версии
+    разбора отбрасывается: записи и статусы в нём разобраны по-старому.
+    """
+    pep_state = load_state(path)
+    if pep_state.get('parser_version') != PARSER_VERSION:
+        return {'parser_version': PARSER_VERSION}
+    return pep_state
+
+
+def get_pep_states(pep_state, tr_links):
+    """Метод возвращает сохранённые хеши и статусы для текущих ссылок."""
+    saved_states = pep_state.get('peps', {})
+    return {
+        tr_link: tuple(saved_states[tr_link])
+        for tr_link in tr_links if tr_link in saved_states
+    }
+
+
+def log_unexpected_statuses(records):
+    """Метод логирует PEP, статус карточки которых не ждали по оглавлению."""
+    for record in records:
+        logging.info(PEP_LOG_INFO.format(
+            tr_link=record.url,
+            pep_status=record.page_status,
+            tr_status=record.index_status,
+        ))
+
+
+def crawl_pep_records(
+    session,
+    records,
+    cli_args=None,
+    pep_state=None,
+    state_path=None,
+    journal=None,
+    pep_states=None,
+):
+    """
+    Метод загружает статусы из карточек PEP и отдаёт записи по мере
+    готовности. Записи, карточки которых не загрузились, пропускаются.
+    pep_states - сохранённые хеши и статусы всех ссылок оглавления.
+    """
     log_list = []
-    tr_tags = table.find_all('tr')
-    for tr_tag in tqdm(tr_tags):
-        tr_status = get_main_status(tr_tag)
-        tr_link = urljoin(PEP_URL, find_tag(tr_tag, 'a')['href'])
-        try:
-            soup = get_soup(session, tr_link)
-        except ConnectionError as error:
-            log_list.append(
-                CONNECTION_MESSAGE_ERROR.format(url=tr_link, error=error),
-            )
-            continue
-        pep_status = get_single_status(soup)
-        if pep_status not in tr_status:
-            not_equals_statuses.append(
-                PEP_LOG_INFO.format(
-                    tr_link=tr_link,
-                    pep_status=pep_status,
-                    tr_status=tr_status,
-                ),
-            )
-        counts_statuses[pep_status] += 1
+    if pep_state is not None and pep_states is None:
+        pep_states = get_pep_states(
+            pep_state, [record.url for record in records],
+        )
+    with open_parsed_cache(cli_args) as parsed_cache, open_parse_pool(
+        cli_args,
+    ) as parse_pool:
+        get_status = partial(
+            get_pep_status,
+            fast_status=getattr(cli_args, 'fast_status', False),
+            pep_states=pep_states,
+            parsed_cache=parsed_cache,
+            parse_pool=parse_pool,
+        )
+        for (tr_link, future), record in zip(
+            fetch_all(
+                get_status,
+                session,
+                [record.url for record in records],
+                cli_args,
+            ),
+            records,
+        ):
+            try:
+                record.page_status = future.result()
+            except ConnectionError as error:
+                log_list.append(
+                    CONNECTION_MESSAGE_ERROR.format(url=tr_link, error=error),
+                )
+                continue
+            if journal is not None:
+                journal.add(record.url, record.page_status)
+            yield record
 
+    if pep_state is not None:
+        pep_state['peps'] = pep_states
+        save_state(state_path, pep_state)
     list(map(logging.error, log_list))
-    list(map(logging.info, not_equals_statuses))
-    return [
-        ('Статус', 'Количество'),
-        *counts_statuses.items(),
-        ('Всего', sum(counts_statuses.values())),
-    ]
+
+
+def resume_pep_records(
+    session, records, cli_args, pep_state, state_path, journal,
+):
+    """
+    Метод берёт статусы уже обработанных PEP из журнала,
+    загружает остальные и отдаёт все записи в порядке оглавления.
+    """
+    links = [record.url for record in records]
+    done_links, _ = journal.split(links)
+    done_links = set(done_links)
+    restored, pending = [], []
+    for record in records:
+        if record.url in done_links:
+            record.page_status = journal.entries[record.url]
+            restored.append(record)
+        else:
+            pending.append(record)
+    return merge_in_order(
+        links,
+        restored,
+        crawl_pep_records(
+            session,
+            pending,
+            cli_args,
+            pep_state,
+            state_path,
+            journal,
+            None if pep_state is None else get_pep_states(pep_state, links),
+        ),
+        attrgetter('url'),
+    )
+
+
+def pep_table(records, detailed=False):
+    """
+    Метод строит таблицу результатов pep по записям со статусами:
+    строку на каждый PEP или количество по статусам.
+    """
+    yield PEP_FIELD_NAMES if detailed else ('Статус', 'Количество')
+    counts_statuses = defaultdict(int)
+    unexpected_records = []
+    for record in records:
+        if not record.is_expected():
+            unexpected_records.append(record)
+        counts_statuses[record.page_status] += 1
+        if detailed:
+            yield record.to_row()
+    log_unexpected_statuses(unexpected_records)
+    if not detailed:
+        yield from counts_statuses.items()
+        yield ('Всего', sum(counts_statuses.values()))
+
+
+@streamable
+def pep(session, cli_args=None):
+    """
+    Метод возвращает все документы PEP, их типы и статусы.
+    С --detailed - по строке на каждый PEP, иначе количество по статусам.
+    С --shard обрабатывается только часть PEP, записи сохраняются
+    для режима merge.
+    """
+    state_path = BASE_DIR / STATE_DIR / PEP_STATE_FILE
+    pep_state = (
+        load_pep_state(state_path)
+        if getattr(cli_args, 'incremental', False) else None
+    )
+    records = get_pep_records(session, pep_state)
+    shard = getattr(cli_args, 'shard', None)
+    if shard is not None:
+        positions = {
+            record.url: position
+            for position, record in enumerate(records)
+            if in_shard(record.number, shard)
+        }
+        records = [record for record in records if record.url in positions]
+    with open_journal(cli_args, 'pep') as journal:
+        crawled = resume_pep_records(
+            session, records, cli_args, pep_state, state_path, journal,
+        )
+        if shard is not None:
+            crawled = write_shard(
+                crawled, positions, BASE_DIR / SHARDS_DIR, shard,
+            )
+        yield from pep_table(crawled, getattr(cli_args, 'detailed', False))
+
+
+@streamable
+def merge(session, cli_args=None):
+    """
+    Метод объединяет частичные результаты запусков pep с --shard
+    в ту же таблицу, что и запуск pep на одном узле.
+    """
+    yield from pep_table(
+        load_shards(BASE_DIR / SHARDS_DIR),
+        getattr(cli_args, 'detailed', False),
+    )
 
 
 MODE_TO_FUNCTION = {
@@ -171,22 +642,133 @@ MODE_TO_FUNCTION = {
     'download': download,
     'pep': pep,
 }
+# Режимы, которые не входят в all и serve.
+EXTRA_MODE_TO_FUNCTION = {
+    MODE_MERGE: merge,
+    MODE_CACHE_STATS: cache_stats,
+    MODE_CACHE_VACUUM: cache_vacuum,
+}
+
+
+# Режим download скачивает архив и не возвращает таблицу результатов.
+NOT_SERVED_MODES = ('download',)
+# Вывод в консоль одновременно работающих режимов не перемешивается.
+CONSOLE_OUTPUT_LOCK = Lock()
+
+
+def get_modes(modes):
+    """
+    Метод раскрывает режим all и убирает повторы, сохраняя порядок.
+    Режим serve в список не входит.
+    """
+    expanded = []
+    for mode in modes:
+        if mode == MODE_SERVE:
+            continue
+        for name in MODE_TO_FUNCTION if mode == MODE_ALL else (mode,):
+            if name not in expanded:
+                expanded.append(name)
+    return expanded
+
+
+def get_served_modes(modes):
+    """
+    Метод возвращает функции режимов для serve: перечисленных рядом
+    с serve или всех, кроме режимов без таблицы результатов.
+    """
+    return {
+        mode: MODE_TO_FUNCTION[mode]
+        for mode in modes or MODE_TO_FUNCTION
+        if mode in MODE_TO_FUNCTION and mode not in NOT_SERVED_MODES
+    }
+
+
+def run_mode(session, cli_args):
+    """
+    Метод выполняет режим cli_args.mode и выводит его результаты.
+    Ошибка парсера или соединения в одном режиме пишется в лог
+    и не прерывает остальные.
+    Итоги замеров режима пишутся в лог по его завершении.
+    """
+    try:
+        with mode_metrics(cli_args.mode), profile_mode(cli_args):
+            results = {**MODE_TO_FUNCTION, **EXTRA_MODE_TO_FUNCTION}[
+                cli_args.mode
+            ](session, cli_args)
+            if results is None:
+                return
+            with (
+                CONSOLE_OUTPUT_LOCK
+                if cli_args.output in (None, OUTPUT_PRETTY) else nullcontext()
+            ), get_metrics().phase(PHASE_OUTPUT):
+                control_output(results, cli_args)
+    except (
+        ConnectionError,
+        ParserException,
+        ParserFindTagException,
+        ParserFindUrlException,
+    ) as error:
+        logging.exception(
+            MODE_LOG_ERROR.format(mode=cli_args.mode, error=error),
+        )
+
+
+def run_modes(session, cli_args, modes):
+    """
+    Метод выполняет несколько режимов одновременно на общей сессии.
+    Каждый режим получает свою копию cli_args со своим mode.
+    С --profile режимы выполняются по очереди.
+    """
+    modes_args = [
+        Namespace(**{**vars(cli_args), 'mode': mode}) for mode in modes
+    ]
+    if len(modes_args) == 1 or getattr(cli_args, 'profile', None):
+        # Отчёты профилировщика не должны смешивать режимы.
+        for mode_args in modes_args:
+            run_mode(session, mode_args)
+        return
+    with ThreadPoolExecutor(max_workers=len(modes_args)) as executor:
+        futures = [
+            executor.submit(run_mode, session, mode_args)
+            for mode_args in modes_args
+        ]
+    for future in futures:
+        future.result()
 
 
 def main():
     configure_logging()
     logging.info(START_LOG_INFO)
-    arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
+    arg_parser = configure_argument_parser(
+        [*MODE_TO_FUNCTION, *EXTRA_MODE_TO_FUNCTION, MODE_ALL, MODE_SERVE],
+    )
     args = arg_parser.parse_args()
     logging.info(MAIN_LOG_INFO.format(args=args))
+    modes = get_modes(args.mode)
+    if args.processes is not None:
+        # Поток загрузки ждёт разбора своей страницы, поэтому процессы
+        # пула заняты, только когда потоков не меньше, чем процессов.
+        args.workers = max(args.workers, args.processes)
+    if args.pool_size is None:
+        args.pool_size = args.workers * max(len(modes), 1)
     try:
-        session = requests_cache.CachedSession()
-        if args.clear_cache:
+        session = configure_session(args)
+        if args.clear_cache and args.replay is None:
             session.cache.clear()
-        results = MODE_TO_FUNCTION[args.mode](session)
+        if MODE_SERVE in args.mode:
+            from server import serve
 
-        if results is not None:
-            control_output(results, args)
+            serve(session, args, get_served_modes(modes))
+        else:
+            run_modes(session, args, modes)
+        if args.revalidate:
+            logging.info(REVALIDATE_LOG_INFO.format(
+                revalidated=RESPONSE_COUNTS[RESPONSE_REVALIDATED],
+                downloaded=RESPONSE_COUNTS[RESPONSE_DOWNLOADED],
+                cached=RESPONSE_COUNTS[RESPONSE_CACHED],
+            ))
+        if args.metrics_file is not None:
+            METRICS.save(args.metrics_file)
     except ParserException as error:
         logging.exception(PARSER_LOG_ERROR.format(error=error))
     logging.info(END_LOG_INFO)
@@ -0,0 +1,159 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import logging
+import math
+from threading import Lock
+import time
+
+PHASE_NETWORK = 'network'
+PHASE_OUTPUT = 'output'
+PHASE_PARSE = 'parse'
+
+REQUESTS_LOG_INFO = (
+    'Запросов: {requests}, из кеша: {hits} ({hit_ratio:.0%}), '
+    'получено байт: {bytes}'
+)
+LATENCY_LOG_INFO = (
+    'Время загрузки страницы: p50 {p50:.3f} с, p95 {p95:.3f} с, '
+    'max {max:.3f} с'
+)
+PHASES_LOG_INFO = (
+    'Суммарное время: сеть {network:.2f} с, разбор {parse:.2f} с, '
+    'вывод {output:.2f} с'
+)
+METRICS_FILE_LOG_INFO = 'Замеры запросов сохранены: {path}'
+MODE_LOG_PREFIX = 'Режим {mode}. '
+
+
+def percentile(values, percent):
+    """Метод возвращает перцентиль по ближайшему рангу."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+class Metrics:
+    """
+    Потокобезопасный сборщик замеров запросов, разбора и вывода.
+    Замеры режима передаются и в parent, общий сборщик запуска.
+    """
+
+    def __init__(self, parent=None):
+        self.lock = Lock()
+        self.parent = parent
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+            self.phases = defaultdict(float)
+
+    def get_sample(self, url):
+        return self.samples.setdefault(url, {'url': url, 'parse': 0.0})
+
+    def record_fetch(self, url, latency, from_cache, size):
+        with self.lock:
+            self.get_sample(url).update(
+                latency=latency, from_cache=from_cache, bytes=size,
+            )
+            self.phases[PHASE_NETWORK] += latency
+        if self.parent is not None:
+            self.parent.record_fetch(url, latency, from_cache, size)
+
+    def record_time(self, name, elapsed, url=None):
+        """Метод учитывает время этапа name, для разбора - и по ссылке url."""
+        with self.lock:
+            if url is not None:
+                self.get_sample(url)[name] += elapsed
+            self.phases[name] += elapsed
+        if self.parent is not None:
+            self.parent.record_time(name, elapsed, url)
+
+    @contextmanager
+    def parsing(self, url):
+        """Контекст замеряет время разбора страницы url."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(PHASE_PARSE, time.perf_counter() - start, url)
+
+    @contextmanager
+    def phase(self, name):
+        """Контекст замеряет время этапа name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(name, time.perf_counter() - start)
+
+    def summary(self):
+        with self.lock:
+            samples = [
+                sample for sample in self.samples.values()
+                if 'latency' in sample
+            ]
+            phases = dict(self.phases)
+        latencies = [sample['latency'] for sample in samples]
+        hits = sum(sample['from_cache'] for sample in samples)
+        return {
+            'requests': len(samples),
+            'hits': hits,
+            'hit_ratio': hits / len(samples) if samples else 0.0,
+            'bytes': sum(sample['bytes'] for sample in samples),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'max': max(latencies, default=0.0),
+            **{
+                name: phases.get(name, 0.0)
+                for name in (PHASE_NETWORK, PHASE_PARSE, PHASE_OUTPUT)
+            },
+        }
+
+    def log_summary(self, mode=None):
+        summary = self.summary()
+        prefix = '' if mode is None else MODE_LOG_PREFIX.format(mode=mode)
+        for message in (REQUESTS_LOG_INFO, LATENCY_LOG_INFO, PHASES_LOG_INFO):
+            logging.info(prefix + message.format(**summary))
+
+    def save(self, path):
+        """Метод сохраняет замеры по каждой ссылке и итоги в JSON."""
+        with self.lock:
+            samples = list(self.samples.values())
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'summary': self.summary(), 'samples': samples},
+                file,
+                ensure_ascii=False,
+                indent=4,
+            )
+        logging.info(METRICS_FILE_LOG_INFO.format(path=path))
+
+
+METRICS = Metrics()
+# Сборщик выполняемого режима. Потоки загрузки получают копию контекста
+# режима, поэтому одновременные режимы не смешивают замеры.
+MODE_METRICS = ContextVar('mode_metrics', default=METRICS)
+
+
+def get_metrics():
+    """Метод возвращает сборщик текущего режима или общий METRICS."""
+    return MODE_METRICS.get()
+
+
+@contextmanager
+def mode_metrics(mode):
+    """
+    Контекст собирает замеры режима mode отдельно от других режимов
+    и по завершении пишет их итоги в лог. Общий METRICS тоже их получает.
+    """
+    metrics = Metrics(parent=METRICS)
+    token = MODE_METRICS.set(metrics)
+    try:
+        yield metrics
+    finally:
+        MODE_METRICS.reset(token)
+        metrics.log_summary(mode)
@@ -1,51 +1,144 @@
 import csv
 import datetime as dt
+import gzip
+from importlib.util import find_spec
+from itertools import islice
+import json
 import logging
 
-from prettytable import PrettyTable
-
 from constants import (
     BASE_DIR,
+    COLUMNAR_BATCH_SIZE,
     DATETIME_FORMAT,
+    OUTPUT_COLUMNAR,
     OUTPUT_FILE,
+    OUTPUT_JSONL,
     OUTPUT_PRETTY,
     RESULTS_DIR,
 )
 
 COMPLETE_MESSAGE = 'Файл с результатами был сохранён: {file_path}'
-FILE_PATH_NAME = '{mode}_{date}.csv'
+FILE_PATH_NAME = '{mode}_{date}.{extension}'
+
+
+def get_file_path(cli_args, extension):
+    results_dir = BASE_DIR / RESULTS_DIR
+    results_dir.mkdir(exist_ok=True)
+    return results_dir / (
+        FILE_PATH_NAME.format(
+            mode=cli_args.mode,
+            date=dt.datetime.now().strftime(DATETIME_FORMAT),
+            extension=extension,
+        )
+    )
+
+
+def iter_batches(rows, size=COLUMNAR_BATCH_SIZE):
+    """Метод нарезает поток строк на списки не длиннее size."""
+    rows = iter(rows)
+    return iter(lambda: list(islice(rows, size)), [])
 
 
 def default_output(results, *args):
     for row in results:
-        print(*row)
+        print(*row, flush=True)
 
 
 def pretty_output(results, *args):
+    from prettytable import PrettyTable
+
+    field_names, *rows = results
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = field_names
     table.align = 'l'
-    table.add_rows(results[1:])
+    table.add_rows(rows)
     print(table)
 
 
 def file_output(results, cli_args):
-    results_dir = BASE_DIR / RESULTS_DIR
-    results_dir.mkdir(exist_ok=True)
-    file_path = results_dir / (
-        FILE_PATH_NAME.format(
-            mode=cli_args.mode,
-            date=dt.datetime.now().strftime(DATETIME_FORMAT),
-        )
-    )
-    with open(file_path, 'w', encoding='utf-8') as file:
+    file_path = get_file_path(cli_args, 'csv')
+    with open(file_path, 'w', encoding='utf-8', buffering=1) as file:
         csv.writer(file, csv.unix_dialect).writerows(results)
     logging.info(COMPLETE_MESSAGE.format(file_path=file_path))
 
 
+def jsonl_output(results, cli_args):
+    """Метод пишет строки результатов JSON-объектами, по одному на строку."""
+    results = iter(results)
+    field_names = next(results)
+    file_path = get_file_path(cli_args, 'jsonl')
+    with open(file_path, 'w', encoding='utf-8', buffering=1) as file:
+        for row in results:
+            file.write(
+                json.dumps(dict(zip(field_names, row)), ensure_ascii=False),
+            )
+            file.write('\n')
+    logging.info(COMPLETE_MESSAGE.format(file_path=file_path))
+
+
+def write_parquet(field_names, batches, file_path):
+    """
+    Метод пишет пачки строк группами строк Parquet.
+    Все колонки - строки с пропусками: схема задана до первой пачки,
+    поэтому пустая в ней колонка не ломает следующие пачки,
+    а результаты без строк дают файл с одной схемой.
+    """
+    import pyarrow
+    import pyarrow.parquet as parquet
+
+    schema = pyarrow.schema(
+        [pyarrow.field(name, pyarrow.string()) for name in field_names],
+    )
+    with parquet.ParquetWriter(file_path, schema) as writer:
+        for batch in batches:
+            writer.write_table(pyarrow.Table.from_pydict(
+                {
+                    name: [
+                        None if value is None else str(value)
+                        for value in column
+                    ]
+                    for name, column in zip(field_names, zip(*batch))
+                },
+                schema=schema,
+            ))
+
+
+def write_json_columns(field_names, batches, file_path):
+    """
+    Метод пишет пачки строк колонками в сжатый gzip JSON Lines:
+    первая строка - имена колонок, дальше по строке на пачку.
+    """
+    with gzip.open(file_path, 'wt', encoding='utf-8') as file:
+        file.write(json.dumps(field_names, ensure_ascii=False) + '\n')
+        for batch in batches:
+            file.write(json.dumps(
+                [list(column) for column in zip(*batch)],
+                ensure_ascii=False,
+            ) + '\n')
+
+
+def columnar_output(results, cli_args):
+    """
+    Метод пишет результаты по колонкам пачками строк.
+    При установленном pyarrow - в Parquet, иначе в сжатый JSON колонок.
+    """
+    results = iter(results)
+    field_names = list(next(results))
+    batches = iter_batches(results, COLUMNAR_BATCH_SIZE)
+    if find_spec('pyarrow') is not None:
+        file_path = get_file_path(cli_args, 'parquet')
+        write_parquet(field_names, batches, file_path)
+    else:
+        file_path = get_file_path(cli_args, 'columns.json.gz')
+        write_json_columns(field_names, batches, file_path)
+    logging.info(COMPLETE_MESSAGE.format(file_path=file_path))
+
+
 OUTPUT_CHOICES = {
     OUTPUT_PRETTY: pretty_output,
     OUTPUT_FILE: file_output,
+    OUTPUT_JSONL: jsonl_output,
+    OUTPUT_COLUMNAR: columnar_output,
     None: default_output,
 }
 
@@ -0,0 +1,127 @@
+import cProfile
+from contextlib import contextmanager
+import logging
+import pstats
+import sys
+from threading import Lock, setprofile
+import tracemalloc
+
+from constants import (
+    PROFILE_CPU,
+    PROFILE_MEM,
+    PROFILE_STACK_DEPTH,
+    PROFILE_TOP,
+)
+from outputs import get_file_path
+
+PROFILE_LOG_INFO = 'Профиль режима {mode} сохранён: {paths}'
+PEAK_MEMORY_LINE = 'Пик памяти: {peak} байт, занято в конце: {current} байт\n'
+
+
+class ThreadsProfiler:
+    """
+    cProfile для потока режима и всех потоков, запущенных за время
+    его работы: загрузка и разбор страниц идут в пуле потоков.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.profilers = []
+
+    def profile_thread(self, *args):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Начиная с Python 3.12 профилировщик может быть только один:
+            # снимаем хук, иначе он срабатывает на каждый вызов в потоке.
+            sys.setprofile(None)
+            return
+        with self.lock:
+            self.profilers.append(profiler)
+
+    def __enter__(self):
+        setprofile(self.profile_thread)
+        self.profile_thread()
+        return self
+
+    def __exit__(self, *args):
+        setprofile(None)
+        self.profilers[0].disable()
+
+    def get_stats(self):
+        stats = pstats.Stats(self.profilers[0])
+        for profiler in self.profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+
+def save_cpu_profile(profiler, cli_args):
+    """
+    Метод сохраняет отчёт cProfile, отсортированный по общему времени,
+    и файл pstats для snakeviz, gprof2dot или flameprof.
+    """
+    stats = profiler.get_stats()
+    stats_path = get_file_path(cli_args, 'pstats')
+    stats.dump_stats(stats_path)
+    report_path = get_file_path(cli_args, 'cpu.txt')
+    with open(report_path, 'w', encoding='utf-8') as file:
+        stats.stream = file
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP)
+    return report_path, stats_path
+
+
+def format_stack(traceback):
+    return ';'.join(
+        f'{frame.filename}:{frame.lineno}' for frame in traceback
+    )
+
+
+def save_mem_profile(snapshot, traced_memory, cli_args):
+    """
+    Метод сохраняет строки с наибольшим объёмом живых выделений
+    и collapsed-стеки этих выделений для flamegraph.pl или speedscope.
+    """
+    snapshot = snapshot.filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),),
+    )
+    current, peak = traced_memory
+    report_path = get_file_path(cli_args, 'mem.txt')
+    with open(report_path, 'w', encoding='utf-8') as file:
+        file.write(PEAK_MEMORY_LINE.format(peak=peak, current=current))
+        for stat in snapshot.statistics('lineno')[:PROFILE_TOP]:
+            file.write(f'{stat}\n')
+    stacks_path = get_file_path(cli_args, 'mem.collapsed')
+    with open(stacks_path, 'w', encoding='utf-8') as file:
+        for stat in snapshot.statistics('traceback'):
+            file.write(f'{format_stack(stat.traceback)} {stat.size}\n')
+    return report_path, stacks_path
+
+
+@contextmanager
+def profile_mode(cli_args):
+    """
+    Метод выполняет блок под профилировщиком cli_args.profile
+    и сохраняет отчёты режима рядом с результатами.
+    Без --profile блок выполняется как есть.
+    """
+    profile = getattr(cli_args, 'profile', None)
+    if profile == PROFILE_CPU:
+        with ThreadsProfiler() as profiler:
+            yield
+        paths = save_cpu_profile(profiler, cli_args)
+    elif profile == PROFILE_MEM:
+        tracemalloc.start(PROFILE_STACK_DEPTH)
+        try:
+            yield
+            snapshot = tracemalloc.take_snapshot()
+            traced_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        paths = save_mem_profile(snapshot, traced_memory, cli_args)
+    else:
+        yield
+        return
+    logging.info(PROFILE_LOG_INFO.format(
+        mode=cli_args.mode, paths=', '.join(map(str, paths)),
+    ))
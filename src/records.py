@@ -0,0 +1,92 @@
+import sys
+
+from constants import EXPECTED_STATUS
+
+PEP_FIELD_NAMES = (
+    'Номер', 'Ссылка', 'Тип', 'Ожидаемые статусы', 'Статус в карточке',
+)
+# Один экземпляр кортежа ожидаемых статусов на все записи.
+SHARED_EXPECTED_STATUSES = {
+    statuses: statuses for statuses in EXPECTED_STATUS.values()
+}
+
+
+def intern_string(value):
+    """
+    Метод возвращает общий для всех записей экземпляр строки.
+    NavigableString приводится к str, чтобы не держать ссылку на суп.
+    """
+    return None if value is None else sys.intern(str(value))
+
+
+class PepRecord:
+    """
+    Данные одного PEP: номер, ссылка, тип, ожидаемые по оглавлению
+    статусы и статус из карточки. Записи без __dict__, строки и кортежи
+    статусов общие для всех записей.
+    """
+
+    __slots__ = ('number', 'url', '_type', '_index_status', '_page_status')
+
+    def __init__(self, number, url, type_, index_status, page_status=None):
+        self.number = number
+        self.url = url
+        self.type = type_
+        self.index_status = index_status
+        self.page_status = page_status
+
+    @property
+    def type(self):
+        return self._type
+
+    @type.setter
+    def type(self, value):
+        self._type = intern_string(value)
+
+    @property
+    def index_status(self):
+        return self._index_status
+
+    @index_status.setter
+    def index_status(self, value):
+        if isinstance(value, (list, tuple)):
+            value = tuple(value)
+            self._index_status = SHARED_EXPECTED_STATUSES.get(value, value)
+        else:
+            self._index_status = intern_string(value)
+
+    @property
+    def page_status(self):
+        return self._page_status
+
+    @page_status.setter
+    def page_status(self, value):
+        self._page_status = intern_string(value)
+
+    def is_expected(self):
+        """Метод сверяет статус из карточки со статусами из оглавления."""
+        return self.page_status in self.index_status
+
+    def to_row(self):
+        index_status = self.index_status
+        if isinstance(index_status, tuple):
+            index_status = ', '.join(index_status)
+        return (
+            self.number, self.url, self.type, index_status, self.page_status,
+        )
+
+    def to_state(self):
+        """Метод возвращает запись оглавления для файла состояния."""
+        return [self.number, self.url, self.type, self.index_status]
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(*state)
+
+    def __eq__(self, other):
+        if not isinstance(other, PepRecord):
+            return NotImplemented
+        return self.to_row() == other.to_row()
+
+    def __repr__(self):
+        return f'PepRecord{self.to_row()!r}'
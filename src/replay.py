@@ -0,0 +1,120 @@
+import gzip
+import json
+import logging
+
+from requests import RequestException
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from constants import RECORD_SUFFIX
+from exceptions import ParserReplayException
+from storage import get_content_hash
+
+RECORD_LOG_INFO = 'Ответы записываются в {path}'
+REPLAY_LOG_INFO = 'Ответы воспроизводятся из {path}'
+REPLAY_MESSAGE_ERROR = 'Ответа на {url} нет в записи {path}'
+
+
+class ResponseArchive:
+    """
+    Папка со сжатыми ответами: файл на каждую ссылку, в нём строка
+    JSON с кодом, заголовками и кодировкой ответа, затем тело как есть.
+    Ошибки запросов тоже записываются и воспроизводятся.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_path(self, url):
+        return self.path / (get_content_hash(url.encode()) + RECORD_SUFFIX)
+
+    def write(self, url, meta, content=b''):
+        self.path.mkdir(parents=True, exist_ok=True)
+        path = self.get_path(url)
+        temp_path = path.with_name(path.name + '.tmp')
+        with gzip.open(temp_path, 'wb') as file:
+            file.write(json.dumps(meta, ensure_ascii=False).encode() + b'\n')
+            file.write(content)
+        temp_path.replace(path)
+
+    def save(self, url, response):
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in ('content-encoding', 'content-length')
+        }
+        headers['Content-Length'] = str(len(response.content))
+        self.write(
+            url,
+            {
+                'url': response.url,
+                'status_code': response.status_code,
+                'reason': response.reason,
+                'headers': headers,
+                'encoding': response.encoding,
+            },
+            response.content,
+        )
+
+    def save_error(self, url, error):
+        self.write(url, {'error': str(error)})
+
+    def load(self, url):
+        """
+        Метод возвращает записанный ответ на url или повторяет
+        записанную ошибку. Вызывает ParserReplayException, если ответа нет.
+        """
+        try:
+            with gzip.open(self.get_path(url), 'rb') as file:
+                meta = json.loads(file.readline())
+                content = file.read()
+        except FileNotFoundError:
+            raise ParserReplayException(
+                REPLAY_MESSAGE_ERROR.format(url=url, path=self.path),
+            )
+        if 'error' in meta:
+            raise RequestException(meta['error'])
+        response = Response()
+        response.url = meta['url']
+        response.status_code = meta['status_code']
+        response.reason = meta['reason']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = meta['encoding']
+        response._content = content
+        response._content_consumed = True
+        return response
+
+
+class RecordingSession:
+    """
+    Сессия, сохраняющая в архив каждый полученный ответ.
+    Потоковые загрузки не записываются.
+    """
+
+    def __init__(self, session, archive):
+        self.session = session
+        self.archive = archive
+        logging.info(RECORD_LOG_INFO.format(path=archive.path))
+
+    def get(self, url, **kwargs):
+        try:
+            response = self.session.get(url, **kwargs)
+        except RequestException as error:
+            self.archive.save_error(url, error)
+            raise
+        if not kwargs.get('stream', False):
+            self.archive.save(url, response)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+class ReplaySession:
+    """Сессия, отдающая ответы только из архива, без обращения к сети."""
+
+    def __init__(self, archive):
+        self.archive = archive
+        logging.info(REPLAY_LOG_INFO.format(path=archive.path))
+
+    def get(self, url, **kwargs):
+        return self.archive.load(url)
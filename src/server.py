@@ -0,0 +1,163 @@
+from argparse import Namespace
+import datetime as dt
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+from threading import Event, Lock, Thread
+
+from metrics import mode_metrics
+
+NOT_FOUND_MESSAGE_ERROR = 'Нет режима {mode}, доступны: {modes}'
+NOT_READY_MESSAGE_ERROR = 'Результаты режима {mode} ещё не готовы'
+REFRESH_LOG_ERROR = 'Не удалось обновить режим {mode}: {error}'
+REFRESH_LOG_INFO = 'Результаты режимов {modes} обновлены'
+REQUEST_LOG_INFO = 'HTTP {address} {message}'
+SERVE_LOG_INFO = (
+    'Результаты доступны на http://{host}:{port}/, '
+    'обновление раз в {interval} с'
+)
+
+
+class ResultsStore:
+    """
+    Последние результаты режимов, уже закодированные в JSON,
+    чтобы чтение сводилось к отдаче готовых байт.
+    """
+
+    def __init__(self, modes):
+        self.modes = list(modes)
+        self.lock = Lock()
+        self.bodies = {}
+        self.updated = {}
+
+    def set(self, mode, results):
+        field_names, *rows = results
+        updated = dt.datetime.now().isoformat(timespec='seconds')
+        body = json.dumps(
+            {
+                'mode': mode,
+                'updated': updated,
+                'results': [dict(zip(field_names, row)) for row in rows],
+            },
+            ensure_ascii=False,
+        ).encode('utf-8')
+        with self.lock:
+            self.bodies[mode] = body
+            self.updated[mode] = updated
+
+    def get(self, mode):
+        with self.lock:
+            return self.bodies.get(mode)
+
+    def index(self):
+        with self.lock:
+            updated = dict(self.updated)
+        return json.dumps(
+            {'modes': {mode: updated.get(mode) for mode in self.modes}},
+            ensure_ascii=False,
+        ).encode('utf-8')
+
+
+class ResultsHandler(BaseHTTPRequestHandler):
+    """
+    GET / - список режимов и время их обновления,
+    GET /<режим> - последние результаты режима.
+    """
+
+    def do_GET(self):
+        store = self.server.store
+        mode = self.path.split('?')[0].strip('/')
+        if not mode:
+            return self.send_json(HTTPStatus.OK, store.index())
+        if mode not in store.modes:
+            return self.send_error_json(
+                HTTPStatus.NOT_FOUND,
+                NOT_FOUND_MESSAGE_ERROR.format(
+                    mode=mode, modes=', '.join(store.modes),
+                ),
+            )
+        body = store.get(mode)
+        if body is None:
+            return self.send_error_json(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                NOT_READY_MESSAGE_ERROR.format(mode=mode),
+            )
+        self.send_json(HTTPStatus.OK, body)
+
+    def send_json(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, message):
+        self.send_json(status, json.dumps(
+            {'error': message}, ensure_ascii=False,
+        ).encode('utf-8'))
+
+    def log_message(self, format, *args):
+        logging.debug(REQUEST_LOG_INFO.format(
+            address=self.address_string(), message=format % args,
+        ))
+
+
+def make_server(store, host, port):
+    """Метод создаёт HTTP-сервер, отдающий результаты из store."""
+    server = ThreadingHTTPServer((host, port), ResultsHandler)
+    server.store = store
+    return server
+
+
+def refresh_results(session, cli_args, mode_functions, store):
+    """
+    Метод заново выполняет режимы и сохраняет результаты в store.
+    При любой ошибке режима, например на странице неожиданного вида,
+    в store остаются предыдущие результаты, а сервер продолжает работу.
+    """
+    for mode, function in mode_functions.items():
+        mode_args = Namespace(**{**vars(cli_args), 'mode': mode})
+        try:
+            with mode_metrics(mode):
+                store.set(mode, list(function(session, mode_args)))
+        except Exception as error:
+            logging.exception(
+                REFRESH_LOG_ERROR.format(mode=mode, error=error),
+            )
+    logging.info(REFRESH_LOG_INFO.format(modes=', '.join(mode_functions)))
+
+
+def refresh_forever(session, cli_args, mode_functions, store, stop):
+    """Метод обновляет результаты раз в refresh_interval до события stop."""
+    while True:
+        refresh_results(session, cli_args, mode_functions, store)
+        if stop.wait(cli_args.refresh_interval):
+            return
+
+
+def serve(session, cli_args, mode_functions):
+    """
+    Метод держит сессию и результаты режимов в памяти и отдаёт их
+    по HTTP в JSON, обновляя в фоновом потоке.
+    """
+    store = ResultsStore(mode_functions)
+    server = make_server(store, cli_args.host, cli_args.port)
+    stop = Event()
+    Thread(
+        target=refresh_forever,
+        args=(session, cli_args, mode_functions, store, stop),
+        daemon=True,
+    ).start()
+    logging.info(SERVE_LOG_INFO.format(
+        host=cli_args.host,
+        port=server.server_port,
+        interval=cli_args.refresh_interval,
+    ))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
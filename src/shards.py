@@ -0,0 +1,78 @@
+import zlib
+
+from constants import SHARD_FILE
+from exceptions import ParserMergeException
+from records import PepRecord
+from storage import load_state, save_state
+
+SHARDS_COUNT_MESSAGE_ERROR = (
+    'Частичные результаты из запусков с разным числом шардов: {counts}'
+)
+SHARDS_MISSING_MESSAGE_ERROR = 'Нет частичных результатов шардов: {missing}'
+
+
+def in_shard(number, shard):
+    """
+    Метод проверяет, относится ли PEP к шарду (номер, всего шардов).
+    Шард выбирается по crc32 номера, одинаково на всех узлах.
+    """
+    index, count = shard
+    return zlib.crc32(str(number).encode()) % count == index - 1
+
+
+def get_shard_path(shards_dir, shard):
+    index, count = shard
+    return shards_dir / SHARD_FILE.format(index=index, count=count)
+
+
+def write_shard(records, positions, shards_dir, shard):
+    """
+    Метод пропускает записи дальше и после последней сохраняет их
+    частичным результатом шарда вместе с позициями в оглавлении.
+    """
+    rows = []
+    for record in records:
+        rows.append(
+            [positions[record.url], *record.to_state(), record.page_status],
+        )
+        yield record
+    save_state(
+        get_shard_path(shards_dir, shard),
+        {'shard': list(shard), 'records': rows},
+    )
+
+
+def load_shards(shards_dir):
+    """
+    Метод собирает записи всех шардов в порядке строк оглавления.
+    Вызывает ParserMergeException, если шардов не хватает
+    или они из запусков с разным числом шардов.
+    """
+    shards = {}
+    for path in sorted(shards_dir.glob(SHARD_FILE.format(
+        index='*', count='*',
+    ))):
+        state = load_state(path)
+        if 'shard' in state:
+            shards[tuple(state['shard'])] = state['records']
+    counts = {count for _, count in shards}
+    if len(counts) > 1:
+        raise ParserMergeException(SHARDS_COUNT_MESSAGE_ERROR.format(
+            counts=', '.join(map(str, sorted(counts))),
+        ))
+    count = counts.pop() if counts else 1
+    missing = [
+        f'{index}/{count}' for index in range(1, count + 1)
+        if (index, count) not in shards
+    ]
+    if missing:
+        raise ParserMergeException(
+            SHARDS_MISSING_MESSAGE_ERROR.format(missing=', '.join(missing)),
+        )
+    return [
+        PepRecord(*row[1:])
+        for row in sorted(
+            (row for rows in shards.values() for row in rows),
+            key=lambda row: row[0],
+        )
+    ]
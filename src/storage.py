@@ -0,0 +1,159 @@
+import hashlib
+import json
+import logging
+import sqlite3
+from threading import Lock
+import time
+
+from constants import DEFAULT_PARSED_CACHE_SIZE
+
+STATE_MESSAGE_ERROR = 'Файл состояния {path} повреждён и будет перезаписан'
+JOURNAL_LOG_INFO = 'Из журнала {path} восстановлено записей: {count}'
+
+CREATE_PARSED_TABLE = (
+    'CREATE TABLE IF NOT EXISTS parsed '
+    '(key TEXT PRIMARY KEY, value TEXT NOT NULL, used_at REAL NOT NULL)'
+)
+CREATE_PARSED_INDEX = (
+    'CREATE INDEX IF NOT EXISTS parsed_used_at ON parsed (used_at)'
+)
+COUNT_PARSED = 'SELECT COUNT(*) FROM parsed'
+SELECT_PARSED = 'SELECT value FROM parsed WHERE key = ?'
+TOUCH_PARSED = 'UPDATE parsed SET used_at = ? WHERE key = ?'
+INSERT_PARSED = 'INSERT OR IGNORE INTO parsed VALUES (?, ?, ?)'
+EVICT_PARSED = (
+    'DELETE FROM parsed WHERE key IN ('
+    'SELECT key FROM parsed ORDER BY used_at DESC LIMIT -1 OFFSET ?)'
+)
+
+
+def get_content_hash(content):
+    """Метод возвращает хеш тела ответа."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def load_state(path):
+    """Метод загружает сохранённое состояние парсера из JSON."""
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        logging.warning(STATE_MESSAGE_ERROR.format(path=path))
+        return {}
+
+
+def save_state(path, state):
+    """Метод атомарно сохраняет состояние парсера в JSON."""
+    path.parent.mkdir(exist_ok=True)
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(state, file, ensure_ascii=False)
+    temp_path.replace(path)
+
+
+class Journal:
+    """
+    Журнал обработанных ссылок в JSON Lines: каждая строка дописывается
+    сразу после обработки ссылки, поэтому прерванный запуск можно
+    продолжить с resume=True. Без path журнал ничего не пишет.
+    """
+
+    def __init__(self, path=None, resume=False):
+        self.path = path
+        self.entries = {}
+        self.file = None
+        if path is None:
+            return
+        if resume:
+            self.entries = self.load(path)
+            logging.info(JOURNAL_LOG_INFO.format(
+                path=path, count=len(self.entries),
+            ))
+        path.parent.mkdir(exist_ok=True)
+        self.file = open(
+            path, 'a' if resume else 'w', encoding='utf-8', buffering=1,
+        )
+
+    @staticmethod
+    def load(path):
+        """Метод читает журнал, пропуская недописанную при сбое строку."""
+        entries = {}
+        try:
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        key, value = json.loads(line)
+                    except (TypeError, ValueError):
+                        continue
+                    entries[key] = value
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def split(self, keys):
+        """Метод делит ключи на уже записанные в журнал и необработанные."""
+        return (
+            [key for key in keys if key in self.entries],
+            [key for key in keys if key not in self.entries],
+        )
+
+    def add(self, key, value):
+        if self.file is None:
+            return
+        self.file.write(json.dumps([key, value], ensure_ascii=False) + '\n')
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+    def remove(self):
+        """Метод удаляет журнал завершённого запуска."""
+        self.close()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+class ParsedCache:
+    """
+    Кеш разобранных со страниц значений в SQLite.
+    Хранит не больше max_entries записей, вытесняя давно не читанные.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_PARSED_CACHE_SIZE):
+        path.parent.mkdir(exist_ok=True)
+        self.max_entries = max_entries
+        self.lock = Lock()
+        self.connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None,
+        )
+        self.connection.execute(CREATE_PARSED_TABLE)
+        self.connection.execute(CREATE_PARSED_INDEX)
+        self.size = self.connection.execute(COUNT_PARSED).fetchone()[0]
+        self.evict()
+
+    def evict(self):
+        """Метод удаляет давно не читанные записи сверх max_entries."""
+        if self.size > self.max_entries:
+            self.connection.execute(EVICT_PARSED, (self.max_entries,))
+            self.size = self.max_entries
+
+    def get_or_set(self, key, compute):
+        """Метод возвращает значение по ключу, вычисляя его при промахе."""
+        with self.lock:
+            row = self.connection.execute(SELECT_PARSED, (key,)).fetchone()
+            if row is not None:
+                self.connection.execute(TOUCH_PARSED, (time.time(), key))
+                return json.loads(row[0])
+        value = compute()
+        with self.lock:
+            self.size += self.connection.execute(
+                INSERT_PARSED,
+                (key, json.dumps(value, ensure_ascii=False), time.time()),
+            ).rowcount
+            self.evict()
+        return value
+
+    def close(self):
+        self.connection.close()
@@ -1,18 +1,64 @@
-from requests import RequestException
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import lru_cache
+import hashlib
+from threading import Lock
+import time
+import zipfile
 
-from bs4 import BeautifulSoup
-
-from exceptions import ParserFindTagException
+from constants import (
+    DEFAULT_WORKERS,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_PART_SUFFIX,
+)
+from exceptions import ParserDownloadException, ParserFindTagException
+from metrics import get_metrics
 
 CONNECTION_MESSAGE_ERROR = 'Не удается подключиться к {url}, ошибка: {error}'
 FIND_TAG_MESSAGE_ERROR = 'Не найден тег {tag} {attrs}'
+SIZE_MESSAGE_ERROR = (
+    'Размер файла {path} ({size} байт) не совпадает с ожидаемым ({total})'
+)
+ARCHIVE_MESSAGE_ERROR = 'Архив {path} повреждён: {error}'
+RESPONSE_CACHED = 'cached'
+RESPONSE_DOWNLOADED = 'downloaded'
+RESPONSE_REVALIDATED = 'revalidated'
+
+# Сколько ответов взято из кеша, подтверждено ответом 304 и скачано заново.
+RESPONSE_COUNTS = Counter()
+RESPONSE_COUNTS_LOCK = Lock()
+
+FIELD_VALUE_XPATH = '//dt[string() = $field]/following-sibling::*[1]'
+
+
+def count_response(response):
+    """Метод учитывает, откуда получен ответ: кеш, 304 или сеть."""
+    if getattr(response, 'revalidated', False):
+        source = RESPONSE_REVALIDATED
+    elif getattr(response, 'from_cache', False):
+        source = RESPONSE_CACHED
+    else:
+        source = RESPONSE_DOWNLOADED
+    with RESPONSE_COUNTS_LOCK:
+        RESPONSE_COUNTS[source] += 1
 
 
 def get_response(session, url, encoding='utf-8'):
     """Метод возвращает ответ с веб-сайта."""
+    from requests import RequestException
+
     try:
+        start = time.perf_counter()
         response = session.get(url)
         response.encoding = encoding
+        get_metrics().record_fetch(
+            response.url,
+            time.perf_counter() - start,
+            getattr(response, 'from_cache', False),
+            len(response.content),
+        )
+        count_response(response)
         return response
     except RequestException as error:
         raise ConnectionError(
@@ -20,9 +66,152 @@ def get_response(session, url, encoding='utf-8'):
         )
 
 
-def get_soup(session, url, features='lxml'):
+def get_total_size(response, offset):
+    """Метод возвращает полный размер файла из заголовков ответа."""
+    content_range = response.headers.get('Content-Range')
+    if content_range is not None:
+        total = content_range.rsplit('/', 1)[-1]
+        return None if total == '*' else int(total)
+    content_length = response.headers.get('Content-Length')
+    if content_length is None:
+        return None
+    return offset + int(content_length)
+
+
+def check_archive(path):
+    """Метод сверяет контрольные суммы CRC всех файлов zip-архива."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            broken_name = archive.testzip()
+    except zipfile.BadZipFile as error:
+        raise ParserDownloadException(
+            ARCHIVE_MESSAGE_ERROR.format(path=path, error=error),
+        )
+    if broken_name is not None:
+        raise ParserDownloadException(
+            ARCHIVE_MESSAGE_ERROR.format(path=path, error=broken_name),
+        )
+
+
+def write_chunks(response, part_path, offset, chunk_size):
+    """
+    Метод дописывает тело ответа в файл part_path кусками chunk_size.
+    Возвращает sha256 всего файла, включая уже скачанные offset байт.
+    """
+    checksum = hashlib.sha256()
+    with open(part_path, 'ab' if offset else 'wb') as file:
+        if offset:
+            with open(part_path, 'rb') as part:
+                for chunk in iter(lambda: part.read(chunk_size), b''):
+                    checksum.update(chunk)
+        for chunk in response.iter_content(chunk_size):
+            file.write(chunk)
+            checksum.update(chunk)
+    return checksum
+
+
+def download_file(
+    session, url, file_path, chunk_size=DOWNLOAD_CHUNK_SIZE, check=None,
+):
+    """
+    Метод потоково скачивает файл кусками в обход кеша.
+    Частично скачанный файл .part докачивается через заголовок Range,
+    после проверки размера и check файл переименовывается в file_path.
+    Возвращает sha256 файла.
+    """
+    from requests import RequestException
+
+    part_path = file_path.with_name(file_path.name + DOWNLOAD_PART_SUFFIX)
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    # Range и размер части считаются в байтах тела как есть,
+    # поэтому сервер не должен сжимать ответ.
+    headers = {'Cache-Control': 'no-store', 'Accept-Encoding': 'identity'}
+    if offset:
+        headers['Range'] = f'bytes={offset}-'
+    try:
+        with session.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 416 and offset:
+                part_path.unlink()
+                return download_file(
+                    session, url, file_path, chunk_size, check,
+                )
+            response.raise_for_status()
+            if response.status_code != 206:
+                offset = 0
+            total = get_total_size(response, offset)
+            checksum = write_chunks(response, part_path, offset, chunk_size)
+    except RequestException as error:
+        raise ConnectionError(
+            CONNECTION_MESSAGE_ERROR.format(url=url, error=error),
+        )
+    try:
+        size = part_path.stat().st_size
+        if total is not None and size != total:
+            raise ParserDownloadException(SIZE_MESSAGE_ERROR.format(
+                path=part_path, size=size, total=total,
+            ))
+        if check is not None:
+            check(part_path)
+    except ParserDownloadException:
+        part_path.unlink()
+        raise
+    part_path.replace(file_path)
+    return checksum.hexdigest()
+
+
+def make_soup(text, features='lxml', parse_only=None):
+    """
+    Метод возвращает суп из текста страницы.
+    parse_only - аргументы SoupStrainer, суп строится только из этих тегов.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    return BeautifulSoup(
+        text,
+        features=features,
+        parse_only=None if parse_only is None else SoupStrainer(**parse_only),
+    )
+
+
+def get_soup(session, url, features='lxml', parse_only=None):
     """Метод возвращает суп."""
-    return BeautifulSoup(get_response(session, url).text, features=features)
+    response = get_response(session, url)
+    with get_metrics().parsing(response.url):
+        return make_soup(response.text, features, parse_only)
+
+
+def get_string(element):
+    """Метод повторяет Tag.string из BeautifulSoup для элемента lxml."""
+    children = list(element)
+    if not children:
+        return element.text
+    if len(children) == 1 and not element.text and not children[0].tail:
+        return get_string(children[0])
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_field_value_xpath():
+    """Метод компилирует FIELD_VALUE_XPATH при первом обращении."""
+    from lxml import etree
+
+    return etree.XPath(FIELD_VALUE_XPATH)
+
+
+def get_field_value(text, field):
+    """
+    Метод находит значение поля списка <dl> по тексту <dt>
+    скомпилированным XPath, без построения супа.
+    Возвращает None, если поле не найдено.
+    """
+    from lxml import etree
+
+    if not text:
+        return None
+    values = get_field_value_xpath()(etree.HTML(text), field=field)
+    if not values:
+        return None
+    return get_string(values[-1])
 
 
 def find_tag(soup, tag, attrs=None):
@@ -33,3 +222,30 @@ def find_tag(soup, tag, attrs=None):
             FIND_TAG_MESSAGE_ERROR.format(tag=tag, attrs=attrs),
         )
     return searched_tag
+
+
+def concurrent_map(func, items, workers=DEFAULT_WORKERS):
+    """
+    Метод выполняет func для каждого элемента в пуле потоков.
+    Возвращает пары (элемент, future) в исходном порядке,
+    прогресс обновляется по мере завершения задач.
+    Если перебор закрыт раньше, задачи из очереди отменяются.
+    """
+    from tqdm import tqdm
+
+    items = list(items)
+    with ThreadPoolExecutor(max_workers=workers) as executor, tqdm(
+        total=len(items),
+    ) as progress:
+        # Каждая задача получает свою копию контекста: замеры
+        # запросов попадают в сборщик режима, а не в общий.
+        futures = [
+            executor.submit(copy_context().run, func, item) for item in items
+        ]
+        for future in futures:
+            future.add_done_callback(lambda _: progress.update())
+        try:
+            yield from zip(items, futures)
+        except GeneratorExit:
+            executor.shutdown(cancel_futures=True)
+            raise
@@ -0,0 +1,238 @@
+"""
+Замеры скорости разбора страниц, режимов парсера и способов вывода.
+
+Страницы реального размера из fixture_data.snapshots отдаются
+через requests_mock, сеть не используется.
+
+    python tests/benchmarks.py          # сравнить с benchmarks_baseline.json
+    python tests/benchmarks.py --save   # записать новые базовые значения
+    python tests/benchmarks.py --replay DIR  # режимы на записи --record
+
+Код возврата 1, если какой-то замер медленнее базового больше,
+чем в --tolerance раз и больше, чем на --min-difference секунд.
+Код возврата 2, если базовые значения сняты с другими параметрами.
+"""
+import argparse
+from argparse import Namespace
+from contextlib import ExitStack, redirect_stderr, redirect_stdout
+import io
+import json
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+import timeit
+
+from bs4 import BeautifulSoup
+import requests_mock
+from requests_cache import CachedSession
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(BASE_DIR / 'src'))
+
+import main  # noqa: E402
+import outputs  # noqa: E402
+import replay  # noqa: E402
+import utils  # noqa: E402
+from tests.fixture_data import snapshots  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmarks_baseline.json'
+DEFAULT_MIN_DIFFERENCE = 0.001
+DEFAULT_TOLERANCE = 1.5
+OUTPUT_ROWS = 5000
+PARAMS_MESSAGE_ERROR = (
+    'Базовые значения сняты с параметрами {baseline}, а не {params}: '
+    'запустите с ними или обновите базу через --save'
+)
+REPEAT = 5
+RESULT_LINE = '{name:<32} {seconds:>12.6f} с {verdict}'
+
+
+def measure(func, repeat=REPEAT):
+    """Метод возвращает лучшее время одного вызова func в секундах."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def parse_benchmarks(session):
+    pep_link = snapshots.pep_link(8)
+    pep_text = utils.get_response(session, pep_link).text
+    pep_soup = BeautifulSoup(pep_text, 'lxml')
+    tr_tag = BeautifulSoup(
+        snapshots.pep_index_page(1), 'lxml',
+    ).tbody.find('tr')
+    return {
+        'get_soup': lambda: utils.get_soup(session, pep_link),
+        'get_soup_parse_only': lambda: utils.get_soup(
+            session, pep_link, parse_only=main.PEP_PARSE_ONLY,
+        ),
+        'get_single_status': lambda: main.get_single_status(pep_soup),
+        'get_fast_status': lambda: main.get_fast_status(pep_text),
+        'get_main_status': lambda: main.get_main_status(tr_tag),
+    }
+
+
+def mode_benchmarks(session):
+    return {
+        f'mode_{name}': (
+            lambda function=function: function(session, Namespace())
+        )
+        for name, function in main.MODE_TO_FUNCTION.items()
+    }
+
+
+def output_benchmarks():
+    rows = [
+        ('Ссылка на статью', 'Заголовок', 'Редактор, автор'),
+        *(
+            (
+                snapshots.whats_new_link(f'3.{index}'),
+                f'What’s New In Python 3.{index}',
+                'Editor: Author',
+            )
+            for index in range(OUTPUT_ROWS)
+        ),
+    ]
+    return {
+        f'output_{output or "default"}': (
+            lambda function=function, output=output: function(
+                rows, Namespace(mode='bench', output=output),
+            )
+        )
+        for output, function in outputs.OUTPUT_CHOICES.items()
+    }
+
+
+def run(peps_count, archive_size, replay_dir=None):
+    with ExitStack() as stack:
+        temp_dir = Path(stack.enter_context(TemporaryDirectory()))
+        mock = stack.enter_context(requests_mock.Mocker())
+        stack.enter_context(redirect_stdout(io.StringIO()))
+        stack.enter_context(redirect_stderr(io.StringIO()))
+        main.BASE_DIR = outputs.BASE_DIR = temp_dir
+        snapshots.register(mock, peps_count, archive_size)
+        session = CachedSession(backend='memory')
+        benchmarks = {
+            **parse_benchmarks(session),
+            **mode_benchmarks(
+                session if replay_dir is None
+                else replay.ReplaySession(replay.ResponseArchive(replay_dir)),
+            ),
+            **output_benchmarks(),
+        }
+        return {
+            name: measure(func, repeat=REPEAT if name.startswith(
+                ('get_', 'output_'),
+            ) else 1)
+            for name, func in benchmarks.items()
+        }
+
+
+def get_params(args):
+    """Метод возвращает параметры запуска, от которых зависят замеры."""
+    return {
+        'peps': args.peps,
+        'archive_size': args.archive_size,
+        'replay': None if args.replay is None else str(args.replay),
+        'output_rows': OUTPUT_ROWS,
+        'repeat': REPEAT,
+    }
+
+
+def compare(results, baseline, tolerance, min_difference=0):
+    """
+    Метод печатает замеры и возвращает регрессии: замеры медленнее
+    базовых больше, чем в tolerance раз и на min_difference секунд.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            verdict = 'нет базового значения'
+        else:
+            verdict = f'x{seconds / base:.2f}'
+            if (
+                seconds > base * tolerance
+                and seconds - base > min_difference
+            ):
+                verdict += ' РЕГРЕССИЯ'
+                regressions.append(name)
+        print(RESULT_LINE.format(name=name, seconds=seconds, verdict=verdict))
+    return regressions
+
+
+def configure_argument_parser():
+    parser = argparse.ArgumentParser(description='Замеры скорости парсера')
+    parser.add_argument(
+        '--save',
+        help='Записать результаты как базовые значения',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='Во сколько раз замер может быть медленнее базового',
+    )
+    parser.add_argument(
+        '--min-difference',
+        type=float,
+        default=DEFAULT_MIN_DIFFERENCE,
+        help=(
+            'На сколько секунд замер может быть медленнее базового '
+            'при любом --tolerance'
+        ),
+    )
+    parser.add_argument(
+        '--peps',
+        type=int,
+        default=300,
+        help='Количество страниц PEP в оглавлении',
+    )
+    parser.add_argument(
+        '--archive-size',
+        type=int,
+        default=8 * 1024 * 1024,
+        help='Размер архива документации в байтах',
+    )
+    parser.add_argument(
+        '--replay',
+        type=Path,
+        metavar='DIR',
+        help='Замерять режимы на ответах, записанных с --record в DIR',
+    )
+    return parser
+
+
+def benchmark():
+    args = configure_argument_parser().parse_args()
+    params = get_params(args)
+    if not args.save:
+        with open(BASELINE_PATH, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline.get('params') != params:
+            print(PARAMS_MESSAGE_ERROR.format(
+                baseline=baseline.get('params'), params=params,
+            ))
+            return 2
+    results = run(args.peps, args.archive_size, args.replay)
+    if args.save:
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'params': params, 'results': results},
+                file,
+                indent=4,
+                sort_keys=True,
+            )
+            file.write('\n')
+        compare(results, {}, args.tolerance)
+        return 0
+    regressions = compare(
+        results, baseline['results'], args.tolerance, args.min_difference,
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(benchmark())
@@ -2,6 +2,7 @@ import pytest
 import sys
 from pathlib import Path
 from bs4 import BeautifulSoup
+import requests
 import requests_mock
 from argparse import Namespace
 from typing import List, Tuple
@@ -87,6 +88,41 @@ def soup(response_page):
     return BeautifulSoup(response, features='lxml')
 
 
+@pytest.fixture
+def pep_site(mock_session) -> CachedSession:
+    """Сессия, отдающая оглавление PEP и карточки из fixture_data.pages"""
+    from tests.fixture_data import pages
+    with requests_mock.Mocker() as mock:
+        mock.get(pages.PEP_LIST_URL, text=pages.pep_index_page())
+        for number, abbr, status in pages.PEPS:
+            mock.get(
+                pages.pep_link(number),
+                text=pages.pep_page(number, abbr, status),
+            )
+        for number in pages.UNREACHABLE_PEPS:
+            mock.get(
+                pages.pep_link(number),
+                exc=requests.exceptions.ConnectTimeout,
+            )
+        mock_session.requests_mock = mock
+        yield mock_session
+
+
+@pytest.fixture
+def whats_new_site(mock_session) -> CachedSession:
+    """Сессия, отдающая страницы whatsnew из fixture_data.pages"""
+    from tests.fixture_data import pages
+    with requests_mock.Mocker() as mock:
+        mock.get(pages.WHATS_NEW_URL, text=pages.whats_new_index_page())
+        for version in pages.WHATS_NEW_VERSIONS:
+            mock.get(
+                pages.whats_new_link(version),
+                text=pages.whats_new_page(version),
+            )
+        mock_session.requests_mock = mock
+        yield mock_session
+
+
 @pytest.fixture
 def pep_namespace():
     return Namespace(mode='pep', clear_cache=False, output='file')
@@ -0,0 +1,128 @@
+PEP_LIST_URL = 'https://peps.python.org/numerical/'
+PEP_URL = 'https://peps.python.org/'
+
+PEP_INDEX_ROW = (
+    '<tr class="row-odd">'
+    '<td><abbr title="{title}">{abbr}</abbr></td>'
+    '<td><a class="pep reference internal" href="../pep-{number:04d}/">'
+    '{number}</a></td>'
+    '<td><a class="pep reference internal" href="../pep-{number:04d}/">'
+    'PEP {number} title</a></td>'
+    '<td>Author</td>'
+    '</tr>'
+)
+PEP_INDEX_PAGE = (
+    '<html><head><title>Numerical Index</title></head><body>'
+    '<h1>Numerical Index</h1>'
+    '<table class="pep-zero-table docutils align-default">'
+    '<thead><tr><th>&#160;</th><th>PEP</th><th>Title</th>'
+    '<th>Authors</th></tr></thead>'
+    '<tbody>{rows}</tbody>'
+    '</table>'
+    '</body></html>'
+)
+PEP_PAGE = (
+    '<html><head><title>PEP {number}</title></head><body>'
+    '<section id="pep-content">'
+    '<h1 class="page-title">PEP {number} title</h1>'
+    '<dl class="rfc2822 field-list simple">'
+    '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Author</dd>'
+    '<dt class="field-even">Status<span class="colon">:</span></dt>'
+    '<dd class="field-even"><abbr title="{status_title}">{status}</abbr>'
+    '</dd>'
+    '<dt class="field-odd">Type<span class="colon">:</span></dt>'
+    '<dd class="field-odd"><abbr title="Type">{type_}</abbr></dd>'
+    '</dl>'
+    '<p>Body of PEP {number}.</p>'
+    '</section>'
+    '</body></html>'
+)
+
+# (номер, аббревиатура в таблице, статус в карточке)
+PEPS = (
+    (1, 'PA', 'Active'),
+    (8, 'PA', 'Active'),
+    (20, 'IA', 'Active'),
+    (202, 'PF', 'Final'),
+    (234, 'SR', 'Rejected'),
+    (401, 'PF', 'April Fool!'),
+    (3000, 'PF', 'Final'),
+    (3099, 'PD', 'Deferred'),
+    (3100, 'SW', 'Withdrawn'),
+    (3333, 'IS', 'Final'),
+    (8000, 'I', 'Draft'),
+    (8100, 'SP', 'Provisional'),
+)
+UNREACHABLE_PEPS = (9999,)
+TYPES = {'I': 'Informational', 'P': 'Process', 'S': 'Standards Track'}
+
+
+def pep_link(number):
+    return f'{PEP_URL}pep-{number:04d}/'
+
+
+def pep_index_page():
+    return PEP_INDEX_PAGE.format(rows=''.join(
+        PEP_INDEX_ROW.format(title=abbr, abbr=abbr, number=number)
+        for number, abbr, _ in (*PEPS, *(
+            (number, 'SF', None) for number in UNREACHABLE_PEPS
+        ))
+    ))
+
+
+def pep_page(number, abbr, status):
+    return PEP_PAGE.format(
+        number=number,
+        status=status,
+        status_title=status,
+        type_=TYPES[abbr[0]],
+    )
+
+
+WHATS_NEW_URL = 'https://docs.python.org/3/whatsnew/'
+WHATS_NEW_INDEX_PAGE = (
+    '<html><body><div class="body">'
+    '<section id="what-s-new-in-python">'
+    '<h1>What’s New in Python</h1>'
+    '<div class="toctree-wrapper compound"><ul>{items}</ul></div>'
+    '</section>'
+    '</div></body></html>'
+)
+WHATS_NEW_ITEM = (
+    '<li class="toctree-l1">'
+    '<a class="reference internal" href="{version}.html">'
+    'What’s New In Python {version}</a></li>'
+)
+WHATS_NEW_PAGE = (
+    '<html><body><div class="body">'
+    '<section id="what-s-new-in-python-{slug}">'
+    '<h1>What’s New In Python {version}<a class="headerlink" '
+    'href="#what-s-new-in-python-{slug}">¶</a></h1>'
+    '<dl class="field-list simple">\n'
+    '<dt class="field-odd">Editor<span class="colon">:</span></dt>\n'
+    '<dd class="field-odd"><p>Editor of {version}</p>\n</dd>\n'
+    '</dl>'
+    '<p>This article explains the new features in Python {version}.</p>'
+    '</section>'
+    '</div></body></html>'
+)
+WHATS_NEW_VERSIONS = ('3.13', '3.12', '3.11', '2.7')
+
+
+def whats_new_link(version):
+    return f'{WHATS_NEW_URL}{version}.html'
+
+
+def whats_new_index_page():
+    return WHATS_NEW_INDEX_PAGE.format(items=''.join(
+        WHATS_NEW_ITEM.format(version=version)
+        for version in WHATS_NEW_VERSIONS
+    ))
+
+
+def whats_new_page(version):
+    return WHATS_NEW_PAGE.format(
+        version=version,
+        slug=version.replace('.', '-'),
+    )
@@ -0,0 +1,233 @@
+"""
+Страницы реального размера для замеров скорости.
+Разметка повторяет peps.python.org и docs.python.org,
+содержимое генерируется детерминированно по номеру страницы.
+"""
+import io
+import random
+import zipfile
+
+from tests.fixture_data.pages import (
+    PEP_INDEX_PAGE,
+    PEP_INDEX_ROW,
+    PEP_LIST_URL,
+    WHATS_NEW_INDEX_PAGE,
+    WHATS_NEW_ITEM,
+    WHATS_NEW_URL,
+    pep_link,
+    whats_new_link,
+)
+
+MAIN_DOC_URL = 'https://docs.python.org/3/'
+DOWNLOAD_URL = MAIN_DOC_URL + 'download.html'
+ARCHIVE_URL = MAIN_DOC_URL + 'archives/python-3.13-docs-pdf-a4.zip'
+
+ABBRS = ('SF', 'IA', 'PA', 'SR', 'SW', 'SD', 'SA', 'IF', 'PF', 'SS', 'SP')
+STATUSES = {
+    'A': 'Active',
+    'D': 'Deferred',
+    'F': 'Final',
+    'P': 'Provisional',
+    'R': 'Rejected',
+    'S': 'Superseded',
+    'W': 'Withdrawn',
+}
+TYPES = {'I': 'Informational', 'P': 'Process', 'S': 'Standards Track'}
+WORDS = (
+    'python', 'interpreter', 'module', 'object', 'proposal', 'syntax',
+    'function', 'generator', 'exception', 'backwards', 'compatibility',
+    'reference', 'implementation', 'the', 'a', 'of', 'to', 'is', 'and',
+)
+WHATS_NEW_VERSIONS = tuple(
+    [f'3.{minor}' for minor in range(13, -1, -1)]
+    + [f'2.{minor}' for minor in range(7, -1, -1)]
+)
+DOCS_VERSIONS = (
+    ('3.14', 'in development'),
+    ('3.13', 'stable'),
+    ('3.12', 'stable'),
+    ('3.11', 'security-fixes'),
+    ('3.10', 'security-fixes'),
+    ('3.9', 'security-fixes'),
+    ('3.8', 'EOL'),
+    ('2.7', 'EOL'),
+)
+
+PEP_FIELDS = (
+    '<dl class="rfc2822 field-list simple">'
+    '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Author {number} &lt;author@python.org&gt;</dd>'
+    '<dt class="field-even">Status<span class="colon">:</span></dt>'
+    '<dd class="field-even"><abbr title="{status}">{status}</abbr></dd>'
+    '<dt class="field-odd">Type<span class="colon">:</span></dt>'
+    '<dd class="field-odd"><abbr title="{type_}">{type_}</abbr></dd>'
+    '<dt class="field-even">Created<span class="colon">:</span></dt>'
+    '<dd class="field-even">01-Jan-2001</dd>'
+    '</dl>'
+)
+PAGE = (
+    '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+    '<title>{title}</title>{head}</head><body>'
+    '<nav>{nav}</nav><main>{body}</main><footer>{nav}</footer>'
+    '</body></html>'
+)
+
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def section(rng, index):
+    return (
+        f'<section id="section-{index}"><h2>{text(rng, 4)}'
+        f'<a class="headerlink" href="#section-{index}">¶</a></h2>'
+        f'<p>{text(rng, 60)} <code class="docutils literal">{text(rng, 1)}'
+        f'</code> <a class="reference external" href="#r{index}">'
+        f'{text(rng, 2)}</a> {text(rng, 40)}</p>'
+        f'<div class="highlight"><pre><span class="k">def</span> '
+        f'<span class="nf">f{index}</span>():\n    return {index}\n'
+        f'</pre></div>'
+        f'<ul>{"".join(f"<li>{text(rng, 12)}</li>" for _ in range(4))}</ul>'
+        f'</section>'
+    )
+
+
+def navigation(rng, links):
+    return ''.join(
+        f'<a href="/{index}/">{text(rng, 2)}</a>' for index in range(links)
+    )
+
+
+def pep_abbr(number):
+    return ABBRS[number % len(ABBRS)]
+
+
+def pep_numbers(count):
+    return range(1, count + 1)
+
+
+def pep_index_page(count):
+    return PEP_INDEX_PAGE.format(rows=''.join(
+        PEP_INDEX_ROW.format(
+            title=pep_abbr(number), abbr=pep_abbr(number), number=number,
+        )
+        for number in pep_numbers(count)
+    ))
+
+
+def pep_page(number):
+    rng = random.Random(number)
+    abbr = pep_abbr(number)
+    return PAGE.format(
+        title=f'PEP {number}',
+        head='<link rel="stylesheet" href="/style.css">' * 5,
+        nav=navigation(rng, 40),
+        body=(
+            f'<section id="pep-content"><h1 class="page-title">'
+            f'PEP {number} – {text(rng, 5)}</h1>'
+            + PEP_FIELDS.format(
+                number=number,
+                status=STATUSES[abbr[1]],
+                type_=TYPES[abbr[0]],
+            )
+            + ''.join(
+                section(rng, index)
+                for index in range(rng.randint(15, 60))
+            )
+            + '</section>'
+        ),
+    )
+
+
+def whats_new_index_page():
+    return WHATS_NEW_INDEX_PAGE.format(items=''.join(
+        WHATS_NEW_ITEM.format(version=version)
+        for version in WHATS_NEW_VERSIONS
+    ))
+
+
+def whats_new_page(version):
+    rng = random.Random(version)
+    slug = version.replace('.', '-')
+    return PAGE.format(
+        title=f'What’s New In Python {version}',
+        head='',
+        nav=navigation(rng, 120),
+        body=(
+            f'<section id="what-s-new-in-python-{slug}">'
+            f'<h1>What’s New In Python {version}<a class="headerlink" '
+            f'href="#what-s-new-in-python-{slug}">¶</a></h1>'
+            '<dl class="field-list simple">\n'
+            '<dt class="field-odd">Editor<span class="colon">:</span></dt>\n'
+            f'<dd class="field-odd"><p>{text(rng, 2)}</p>\n</dd>\n</dl>'
+            + ''.join(section(rng, index) for index in range(150))
+            + '</section>'
+        ),
+    )
+
+
+def docs_main_page():
+    rng = random.Random('docs')
+    versions = ''.join(
+        f'<li><a href="https://docs.python.org/{version}/">'
+        f'Python {version} ({status})</a></li>'
+        for version, status in DOCS_VERSIONS
+    )
+    return PAGE.format(
+        title='3.13.0 Documentation',
+        head='',
+        nav=navigation(rng, 60),
+        body=(
+            '<div class="sphinxsidebar"><div class="sphinxsidebarwrapper">'
+            '<h3>Download</h3><p><a href="download.html">Download these '
+            'documents</a></p><h3>Docs by version</h3>'
+            f'<ul>{versions}<li><a href="https://www.python.org/doc/'
+            'versions/">All versions</a></li></ul>'
+            '<h3>Other resources</h3><ul><li><a href="/dev/peps/">PEP Index'
+            '</a></li></ul></div></div>'
+            + ''.join(section(rng, index) for index in range(20))
+        ),
+    )
+
+
+def download_page():
+    rng = random.Random('download')
+    return PAGE.format(
+        title='Download',
+        head='',
+        nav=navigation(rng, 60),
+        body=(
+            '<table class="docutils align-default"><tbody><tr>'
+            '<td>PDF (A4 paper size)</td><td>'
+            f'<a class="reference external" href="{ARCHIVE_URL}">'
+            'Download (ca. 17 MiB)</a></td></tr></tbody></table>'
+        ),
+    )
+
+
+def archive(size):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as file:
+        file.writestr(
+            'docs-pdf/library.pdf',
+            random.Random(0).getrandbits(size * 8).to_bytes(size, 'little'),
+        )
+    return buffer.getvalue()
+
+
+def register(mock, peps_count, archive_size):
+    """Метод регистрирует все страницы в requests_mock.Mocker."""
+    mock.get(PEP_LIST_URL, text=pep_index_page(peps_count))
+    for number in pep_numbers(peps_count):
+        mock.get(pep_link(number), text=pep_page(number))
+    mock.get(WHATS_NEW_URL, text=whats_new_index_page())
+    for version in WHATS_NEW_VERSIONS:
+        mock.get(whats_new_link(version), text=whats_new_page(version))
+    mock.get(MAIN_DOC_URL, text=docs_main_page())
+    mock.get(DOWNLOAD_URL, text=download_page())
+    content = archive(archive_size)
+    mock.get(
+        ARCHIVE_URL,
+        content=content,
+        headers={'Content-Length': str(len(content))},
+    )
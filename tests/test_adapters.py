@@ -0,0 +1,136 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import time
+
+import pytest
+import requests
+
+try:
+    from src import adapters
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `adapters.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `adapters.py`'
+
+
+@pytest.fixture
+def throttled_server():
+    """Сервер отвечает 429 с Retry-After на первые два запроса."""
+    requests_count = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_count.append(self.path)
+            if len(requests_count) <= 2:
+                self.send_response(429)
+                self.send_header('Retry-After', '0')
+            else:
+                self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/', requests_count
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def slow_server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(1)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+    server.server_close()
+
+
+def test_jitter_retry_backoff(monkeypatch):
+    retry = adapters.JitterRetry(total=5, backoff_factor=1).increment(
+        method='GET', url='/',
+    ).increment(method='GET', url='/')
+    monkeypatch.setattr(adapters.random, 'uniform', lambda low, high: high)
+    assert retry.get_backoff_time() == 2
+    monkeypatch.setattr(adapters.random, 'uniform', lambda low, high: low)
+    assert retry.get_backoff_time() == 0
+
+
+def test_token_bucket_rate():
+    bucket = adapters.TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09, (
+        'После первого токена запросы должны идти не чаще rate в секунду'
+    )
+
+
+def test_host_rate_limiter_per_host():
+    limiter = adapters.HostRateLimiter(rate=1)
+    start = time.monotonic()
+    limiter.acquire('https://peps.python.org/pep-0008/')
+    limiter.acquire('https://docs.python.org/3/')
+    assert time.monotonic() - start < 0.5, (
+        'У каждого хоста должно быть своё ведро токенов'
+    )
+    assert set(limiter.buckets) == {'peps.python.org', 'docs.python.org'}
+
+
+def test_adapter_retries_after_429(throttled_server):
+    url, requests_count = throttled_server
+    session = requests.Session()
+    session.mount('http://', adapters.make_adapter(3, 0, rate_limit=100))
+    response = session.get(url)
+    assert response.status_code == 200
+    assert len(requests_count) == 3
+
+
+def test_adapter_retries_take_tokens(monkeypatch, throttled_server):
+    url, requests_count = throttled_server
+    hosts = []
+    acquire_host = adapters.HostRateLimiter.acquire_host
+    monkeypatch.setattr(
+        adapters.HostRateLimiter,
+        'acquire_host',
+        lambda self, host: hosts.append(host) or acquire_host(self, host),
+    )
+    session = requests.Session()
+    session.mount('http://', adapters.make_adapter(3, 0, rate_limit=100))
+    assert session.get(url).status_code == 200
+    assert len(requests_count) == 3
+    assert hosts == ['127.0.0.1'] * 3, (
+        'Каждый повтор запроса должен забирать токен у лимита хоста'
+    )
+
+
+def test_adapter_gives_up(throttled_server):
+    url, requests_count = throttled_server
+    session = requests.Session()
+    session.mount('http://', adapters.make_adapter(1, 0))
+    with pytest.raises(requests.exceptions.RetryError):
+        session.get(url)
+    assert len(requests_count) == 2
+
+
+def test_adapter_default_timeout(slow_server):
+    session = requests.Session()
+    session.mount('http://', adapters.make_adapter(0, 0, timeout=(1, 0.1)))
+    start = time.monotonic()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get(slow_server)
+    assert time.monotonic() - start < 0.9, (
+        'Запрос без своего тайм-аута должен получать тайм-аут адаптера'
+    )
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests_cache
+
+try:
+    from src import cache, configs
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `cache.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `cache.py`'
+
+from tests.conftest import mount_mock_adapter
+
+BODY = 'You are breathtaken'
+
+
+def cached_session(monkeypatch, tmp_path, *args):
+    monkeypatch.setattr(configs, 'BASE_DIR', tmp_path)
+    session = configs.configure_session(
+        configs.configure_argument_parser(['pep']).parse_args(['pep', *args]),
+    )
+    return mount_mock_adapter(session)
+
+
+@pytest.mark.parametrize('codec', ['gzip', 'none'])
+@pytest.mark.parametrize('backend', ['sqlite', 'filesystem'])
+def test_compressed_cache(monkeypatch, tmp_path, backend, codec):
+    session = cached_session(
+        monkeypatch, tmp_path,
+        '--cache-backend', backend, '--cache-compression', codec,
+    )
+    assert session.get('mock://a.test/page').text == BODY
+    response = session.get('mock://a.test/page')
+    assert response.from_cache, 'Ответ должен читаться из кеша'
+    assert response.text == BODY
+    serializer_name = session.cache.responses.serializer.name
+    if codec == 'none':
+        assert serializer_name != 'pickle_gzip'
+    else:
+        assert serializer_name == 'pickle_gzip'
+
+
+def test_compression_level(monkeypatch, tmp_path):
+    sizes = {}
+    for codec in ('none', 'gzip'):
+        session = cached_session(
+            monkeypatch, tmp_path / codec,
+            '--cache-compression', codec, '--cache-compression-level', '9',
+        )
+        session.get('mock://a.test/page')
+        (sizes[codec],) = cache.get_stored_sizes(
+            session.cache.responses,
+        ).values()
+    assert sizes['gzip'] < sizes['none'], (
+        'Сжатый ответ должен занимать в кеше меньше места'
+    )
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'filesystem'])
+def test_stored_sizes_on_disk(monkeypatch, tmp_path, backend):
+    session = cached_session(monkeypatch, tmp_path, '--cache-backend', backend)
+    session.get('mock://a.test/page')
+    responses = session.cache.responses
+    (key,) = responses.keys()
+    if backend == 'filesystem':
+        on_disk = next(responses.paths()).stat().st_size
+    else:
+        with responses.connection() as connection:
+            (value,) = connection.execute(
+                f'SELECT value FROM {responses.table_name}',
+            ).fetchone()
+        on_disk = len(value)
+    assert cache.get_stored_sizes(responses) == {key: on_disk}, (
+        'Размер берётся из хранилища, а не пересжатием ответа'
+    )
+
+
+def test_uncompressed_cache(monkeypatch, tmp_path):
+    plain_session = mount_mock_adapter(
+        requests_cache.CachedSession(str(tmp_path / 'http_cache')),
+    )
+    plain_session.get('mock://a.test/old')
+    plain_session.close()
+    session = cached_session(monkeypatch, tmp_path)
+    header, unreadable, total = cache.cache_stats(session)
+    assert unreadable[:4] == (cache.UNREADABLE_HOST, 1, 0, 0), (
+        'Записи без сжатия не должны ронять cache-stats'
+    )
+    assert unreadable[4] > 0
+    response = session.get('mock://a.test/old')
+    assert response.text == BODY and not response.from_cache, (
+        'Нечитаемая запись должна загружаться заново'
+    )
+    cache.cache_vacuum(session)
+    assert [row[0] for row in cache.cache_stats(session)[1:]] == [
+        'a.test', 'Всего',
+    ], 'cache-vacuum должен удалять нечитаемые записи'
+
+
+def test_cache_stats(monkeypatch, tmp_path):
+    session = cached_session(monkeypatch, tmp_path)
+    for url in ('mock://a.test/1', 'mock://a.test/2', 'mock://b.test/1'):
+        session.get(url)
+    header, *rows, total = cache.cache_stats(session)
+    assert header == cache.CACHE_STATS_FIELD_NAMES
+    assert {row[0]: row[1:3] for row in rows} == {
+        'a.test': (2, 0), 'b.test': (1, 0),
+    }
+    assert total[:4] == ('Всего', 3, 0, 3 * len(BODY))
+    assert total[4] == sum(row[4] for row in rows)
+    session.cache.clear()
+    assert cache.cache_stats(session) == [cache.CACHE_STATS_FIELD_NAMES]
+
+
+def test_cache_vacuum(monkeypatch, tmp_path):
+    session = cached_session(monkeypatch, tmp_path)
+    session.get('mock://a.test/fresh')
+    expired = datetime.now(timezone.utc) - timedelta(days=1)
+    for number in range(20):
+        session.cache.save_response(
+            session.get(f'mock://b.test/{number}'), expires=expired,
+        )
+    assert cache.cache_stats(session)[-1][2] == 20
+    header, deleted, size_before, size_after = cache.cache_vacuum(session)
+    assert header == cache.CACHE_VACUUM_FIELD_NAMES
+    assert deleted[1] == 20, 'Должны удаляться только просроченные ответы'
+    assert size_after[1] <= size_before[1]
+    assert [row[0] for row in cache.cache_stats(session)[1:]] == [
+        'a.test', 'Всего',
+    ]
+
+
+@pytest.mark.parametrize('mode', ['cache_stats', 'cache_vacuum'])
+def test_cache_modes_replay(tmp_path, mode):
+    session = configs.configure_session(
+        configs.configure_argument_parser(['pep']).parse_args(
+            ['pep', '--replay', str(tmp_path)],
+        ),
+    )
+    with pytest.raises(Exception) as excinfo:
+        getattr(cache, mode)(session)
+    assert excinfo.typename == 'ParserException', (
+        'Режимы кеша с --replay должны завершаться понятной ошибкой'
+    )
+    assert '--replay' in str(excinfo.value)
@@ -1,5 +1,7 @@
 import pytest
 import argparse
+
+import requests_cache
 try:
     from src import configs
 except ModuleNotFoundError:
@@ -29,9 +31,13 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'jsonl', 'columnar'),
         'Дополнительные способы вывода данных'
     ),
+    (
+        argparse._StoreAction, ['-w', '--workers'], 'workers',
+        None, 'Количество потоков для загрузки страниц'
+    ),
 ])
 def test_configure_argument_parser(
         action,
@@ -64,3 +70,79 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+def test_configure_session(monkeypatch, tmp_path):
+    monkeypatch.setattr(configs, 'BASE_DIR', tmp_path)
+    args = configs.configure_argument_parser(['pep']).parse_args([
+        'pep',
+        '--cache-backend', 'memory',
+        '--expire-after', 'peps.python.org/pep-0008/=5',
+        '--cache-exclude', 'peps.python.org/pep-0001/',
+    ])
+    session = configs.configure_session(args)
+    urls_expire_after = session.settings.urls_expire_after
+    assert list(urls_expire_after)[:3] == [
+        'peps.python.org/pep-0001/', '*.zip', 'peps.python.org/pep-0008/',
+    ], 'Исключения и шаблоны из командной строки должны идти первыми'
+    assert urls_expire_after['peps.python.org/pep-0001/'] == (
+        requests_cache.DO_NOT_CACHE
+    )
+    assert urls_expire_after['peps.python.org/pep-0008/'] == 5
+    assert isinstance(session.cache, requests_cache.backends.BaseCache)
+
+
+def test_configure_session_sqlite_wal(monkeypatch, tmp_path):
+    monkeypatch.setattr(configs, 'BASE_DIR', tmp_path)
+    args = configs.configure_argument_parser(['pep']).parse_args(['pep'])
+    session = configs.configure_session(args)
+    session.cache.responses['key'] = 'value'
+    with session.cache.responses.connection() as connection:
+        journal_mode = connection.execute('PRAGMA journal_mode').fetchone()
+    assert journal_mode == ('wal',)
+    assert (tmp_path / 'http_cache.sqlite').exists()
+
+
+def test_configure_session_adapter(monkeypatch, tmp_path):
+    monkeypatch.setattr(configs, 'BASE_DIR', tmp_path)
+    args = configs.configure_argument_parser(['pep']).parse_args([
+        'pep',
+        '--cache-backend', 'memory',
+        '--retries', '5',
+        '--backoff', '0.1',
+        '--rate-limit', '2',
+        '--workers', '16',
+        '--read-timeout', '7',
+        '--accept-encoding', 'gzip, br',
+    ])
+    session = configs.configure_session(args)
+    adapter = session.get_adapter('https://peps.python.org/')
+    assert adapter._pool_maxsize == 16, (
+        'Размер пула соединений должен совпадать с --workers'
+    )
+    assert adapter.timeout == (5.0, 7.0)
+    assert session.headers['Accept-Encoding'] == 'gzip, br'
+    assert adapter.max_retries.total == 5
+    assert adapter.max_retries.backoff_factor == 0.1
+    assert 429 in adapter.max_retries.status_forcelist
+    assert adapter.rate_limiter.rate == 2
+    with pytest.raises(SystemExit):
+        configs.configure_argument_parser(['pep']).parse_args(
+            ['pep', '--rate-limit', '0'],
+        )
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1/3', (1, 3)),
+    ('3/3', (3, 3)),
+    ('0/3', None),
+    ('4/3', None),
+    ('a/b', None),
+    ('2', None),
+])
+def test_shard_argument(value, expected):
+    if expected is None:
+        with pytest.raises(argparse.ArgumentTypeError):
+            configs.shard(value)
+    else:
+        assert configs.shard(value) == expected
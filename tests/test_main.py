@@ -1,5 +1,16 @@
 import pytest
+from argparse import Namespace
+import builtins
 from pathlib import Path
+import sys
+import zipfile
+
+from bs4 import BeautifulSoup
+import requests_mock
+from requests_cache import CachedSession
+
+from src.constants import EXPECTED_STATUS
+from tests.fixture_data import pages, snapshots
 try:
     from src import main
 except ModuleNotFoundError:
@@ -112,6 +123,43 @@ def test_download(monkeypatch, tmp_path, mock_session):
     )
 
 
+def test_latest_versions_sidebar(mock_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(main.MAIN_DOC_URL, text=(
+            '<div class="sphinxsidebar">'
+            '<div class="sphinxsidebarwrapper sticky"><ul>'
+            '<li><a href="https://docs.python.org/3.14/">'
+            'Python 3.14 (in development)</a></li>'
+            '<li><a href="https://www.python.org/doc/versions/">'
+            'All versions</a></li></ul></div></div>'
+        ))
+        got = main.latest_versions(mock_session)
+    assert got == [
+        ('Ссылка на документацию', 'Версия', 'Статус'),
+        ('https://docs.python.org/3.14/', '3.14', 'in development'),
+        ('https://www.python.org/doc/versions/', 'All versions', ''),
+    ], 'Сайдбар с несколькими классами должен находиться'
+
+
+def test_download_multiple_classes(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    archive_url = main.MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+    archive_path = tmp_path / 'archive.zip'
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        archive.writestr('docs-pdf/library.pdf', b'%PDF-1.4')
+    with requests_mock.Mocker() as mock:
+        mock.get(main.MAIN_DOC_URL + 'download.html', text=(
+            '<table class="docutils align-default"><tr><td>'
+            f'<a class="reference external" href="{archive_url}">'
+            'Download</a></td></tr></table>'
+        ))
+        mock.get(archive_url, content=archive_path.read_bytes())
+        main.download(mock_session)
+    assert [file.name for file in (tmp_path / 'downloads').iterdir()] == [
+        'python-docs-pdf-a4.zip',
+    ], 'Таблица с классами "docutils align-default" должна находиться'
+
+
 def test_mode_to_function():
     got = main.MODE_TO_FUNCTION
     assert isinstance(got, dict), (
@@ -140,3 +188,290 @@ def test_mode_to_function():
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_pep_workers(caplog, pep_site, workers):
+    caplog.set_level('INFO')
+    got = main.pep(pep_site, Namespace(workers=workers))
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Active', 3),
+        ('Final', 3),
+        ('Rejected', 1),
+        ('April Fool!', 1),
+        ('Deferred', 1),
+        ('Withdrawn', 1),
+        ('Draft', 1),
+        ('Provisional', 1),
+        ('Всего', 12),
+    ], (
+        'Функция `pep` должна считать статусы одинаково '
+        'при любом количестве потоков'
+    )
+    assert 'pep-9999' in caplog.text
+    assert 'Статус в карточке: April Fool!' in caplog.text
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_whats_new_workers(whats_new_site, workers):
+    got = main.whats_new(whats_new_site, Namespace(workers=workers))
+    assert got[0] == ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
+    assert [row[0] for row in got[1:]] == [
+        f'https://docs.python.org/3/whatsnew/{version}.html'
+        for version in ('3.13', '3.12', '3.11', '2.7')
+    ]
+    assert got[1][1] == 'What’s New In Python 3.13¶'
+    assert got[1][2] == ' Editor: Editor of 3.13  '
+
+
+MIXED_STATUS_PAGE = (
+    '<dl><dt>Status:</dt><dd><abbr>Final</abbr> (since 3.0)</dd></dl>'
+)
+
+
+@pytest.mark.parametrize('page, expected', [
+    *(
+        (pages.pep_page(number, abbr, status), status)
+        for number, abbr, status in pages.PEPS
+    ),
+    (MIXED_STATUS_PAGE, None),
+])
+def test_status_extractors(page, expected):
+    assert main.get_single_status(BeautifulSoup(page, 'lxml')) == expected
+    assert main.get_fast_status(page) == expected, (
+        'Быстрый извлекатель статуса должен совпадать с BeautifulSoup'
+    )
+
+
+def test_fast_status_missing_field():
+    assert main.get_fast_status('<html><body><p>PEP</p></body></html>') is None
+    assert main.get_fast_status('') is None
+
+
+@pytest.mark.parametrize('fast_status', [False, True])
+def test_pep_fast_status(pep_site, fast_status):
+    got = main.pep(pep_site, Namespace(fast_status=fast_status))
+    assert got == main.pep(pep_site)
+
+
+def test_pep_incremental(monkeypatch, tmp_path, pep_site):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(incremental=True)
+    expected = main.pep(pep_site)
+    assert main.pep(pep_site, cli_args) == expected
+    assert (tmp_path / 'state' / 'pep.json').exists()
+
+    def parse_forbidden(*args, **kwargs):
+        raise AssertionError('Неизменённые страницы не должны разбираться')
+
+    monkeypatch.setattr(main, 'make_soup', parse_forbidden)
+    assert main.pep(pep_site, cli_args) == expected, (
+        'Повторный запуск с --incremental должен брать статусы из состояния'
+    )
+
+    monkeypatch.undo()
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    parsed = []
+    monkeypatch.setattr(
+        main,
+        'parse_pep_status',
+        lambda text, fast_status: parsed.append(text) or 'Final',
+    )
+    pep_site.cache.clear()
+    pep_site.requests_mock.get(
+        pages.pep_link(3099), text=pages.pep_page(3099, 'PD', 'Final'),
+    )
+    got = dict(main.pep(pep_site, cli_args))
+    assert len(parsed) == 1
+    assert 'Deferred' not in got
+    assert got['Final'] == dict(expected)['Final'] + 1
+
+
+@pytest.mark.parametrize('cli_args', [
+    Namespace(incremental=True),
+    Namespace(memoize=True, memo_size=100),
+])
+def test_pep_parser_version(monkeypatch, tmp_path, pep_site, cli_args):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    expected = main.pep(pep_site, cli_args)
+    parsed = []
+    parse_pep_status = main.parse_pep_status
+    monkeypatch.setattr(
+        main,
+        'parse_pep_status',
+        lambda text, fast_status: (
+            parsed.append(text) or parse_pep_status(text, fast_status)
+        ),
+    )
+    monkeypatch.setattr(main, 'PARSER_VERSION', main.PARSER_VERSION + 1)
+    pep_site.cache.clear()
+    assert main.pep(pep_site, cli_args) == expected
+    assert len(parsed) == len(pages.PEPS), (
+        'Значения, разобранные другой версией парсера, '
+        'должны разбираться заново'
+    )
+
+
+def test_pep_memoize(monkeypatch, tmp_path, pep_site):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(memoize=True, memo_size=100)
+    expected = main.pep(pep_site)
+    assert main.pep(pep_site, cli_args) == expected
+    pep_site.cache.clear()
+    monkeypatch.setattr(main, 'get_single_status', None)
+    assert main.pep(pep_site, cli_args) == expected, (
+        'Страницы с известным хешем не должны разбираться повторно'
+    )
+
+
+@pytest.mark.parametrize('mode, site', [
+    ('whats_new', 'whats_new_site'),
+    ('pep', 'pep_site'),
+])
+def test_stream_rows(request, mode, site):
+    session = request.getfixturevalue(site)
+    mode_function = getattr(main, mode)
+    rows = mode_function(session, Namespace(stream=True))
+    assert not isinstance(rows, list), (
+        'С --stream режим должен отдавать строки генератором'
+    )
+    assert list(rows) == mode_function(session)
+
+
+@pytest.mark.parametrize('mode, site', [
+    ('whats_new', 'whats_new_site'),
+    ('pep', 'pep_site'),
+])
+@pytest.mark.parametrize('fast_status', [False, True])
+def test_parse_processes(request, mode, site, fast_status):
+    session = request.getfixturevalue(site)
+    mode_function = getattr(main, mode)
+    expected = mode_function(session, Namespace(fast_status=fast_status))
+    got = mode_function(session, Namespace(
+        workers=2, processes=2, fast_status=fast_status,
+    ))
+    assert got == expected, (
+        'Разбор в пуле процессов должен давать тот же результат'
+    )
+
+
+def test_parse_pool_not_forked():
+    with main.open_parse_pool(Namespace(processes=1)) as parse_pool:
+        start_method = parse_pool._mp_context.get_start_method()
+    assert start_method in ('forkserver', 'spawn'), (
+        'Пул разбора не должен запускаться через fork из процесса с потоками'
+    )
+
+
+def test_get_modes():
+    assert main.get_modes(['pep', 'pep', 'whats-new']) == ['pep', 'whats-new']
+    assert main.get_modes(['pep', 'all']) == [
+        'pep', 'whats-new', 'latest-versions', 'download',
+    ]
+
+
+def test_run_modes_shared_session(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        snapshots.register(mock, peps_count=5, archive_size=1024)
+        session = CachedSession(backend='memory')
+        main.run_modes(
+            session, Namespace(output=None), main.get_modes(['all']),
+        )
+    out = capsys.readouterr().out
+    for header in (
+        'Ссылка на статью Заголовок Редактор, автор',
+        'Ссылка на документацию Версия Статус',
+        'Статус Количество',
+    ):
+        assert header in out, f'Нет вывода режима с заголовком {header}'
+    assert 'Всего 5' in out
+    assert (tmp_path / 'downloads').is_dir()
+
+
+@pytest.mark.parametrize('error', [
+    'ConnectionError', 'ParserFindTagException', 'ParserFindUrlException',
+])
+@pytest.mark.parametrize('profile', [None, 'mem'])
+def test_run_modes_mode_error(
+    monkeypatch, tmp_path, caplog, capsys, error, profile,
+):
+    outputs = sys.modules[main.control_output.__module__]
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    error_class = getattr(builtins, error, None) or getattr(main, error)
+
+    def failing_mode(session, cli_args):
+        raise error_class('страница недоступна')
+
+    monkeypatch.setitem(main.MODE_TO_FUNCTION, 'whats-new', failing_mode)
+    monkeypatch.setitem(
+        main.MODE_TO_FUNCTION,
+        'pep',
+        lambda session, cli_args: [('Статус', 'Количество'), ('Всего', 0)],
+    )
+    main.run_modes(
+        None, Namespace(output=None, profile=profile), ['whats-new', 'pep'],
+    )
+    assert 'Статус Количество' in capsys.readouterr().out, (
+        'Ошибка одного режима не должна прерывать остальные'
+    )
+    assert 'Режим whats-new завершился ошибкой' in caplog.text
+
+
+def test_pep_detailed(caplog, pep_site):
+    caplog.set_level('INFO')
+    got = main.pep(pep_site, Namespace(detailed=True))
+    assert got[0] == (
+        'Номер', 'Ссылка', 'Тип', 'Ожидаемые статусы', 'Статус в карточке',
+    )
+    assert got[1:] == [
+        (
+            number,
+            pages.pep_link(number),
+            abbr[0],
+            ', '.join(EXPECTED_STATUS[abbr[1]]) if len(abbr) > 1
+            else 'Some unknown status',
+            status,
+        )
+        for number, abbr, status in pages.PEPS
+    ]
+    assert 'pep-0401' in caplog.text, (
+        'PEP с неожиданным статусом должен попасть в лог'
+    )
+
+
+@pytest.mark.parametrize('mode, site, journal_name', [
+    ('whats_new', 'whats_new_site', 'whats-new'),
+    ('pep', 'pep_site', 'pep'),
+])
+def test_resume(monkeypatch, tmp_path, request, mode, site, journal_name):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    session = request.getfixturevalue(site)
+    mode_function = getattr(main, mode)
+    expected = mode_function(session, Namespace(detailed=True))
+    rows = mode_function(
+        session, Namespace(detailed=True, stream=True, checkpoint=True),
+    )
+    interrupted = [next(rows) for _ in range(4)]
+    rows.close()
+    journal_path = tmp_path / 'state' / f'{journal_name}.journal.jsonl'
+    assert journal_path.exists(), 'Прерванный запуск должен оставить журнал'
+    done_links = {row[0] if mode == 'whats_new' else row[1]
+                  for row in interrupted[1:]}
+
+    session.cache.clear()
+    session.requests_mock.reset_mock()
+    got = mode_function(session, Namespace(detailed=True, resume=True))
+    assert got == expected, (
+        'Продолженный запуск должен дать тот же результат'
+    )
+    fetched = {
+        history.url for history in session.requests_mock.request_history
+    }
+    assert not done_links & fetched, (
+        'Ссылки из журнала не должны загружаться повторно'
+    )
+    assert not journal_path.exists(), (
+        'Журнал завершённого запуска должен удаляться'
+    )
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import json
+import sys
+
+import requests_mock
+
+try:
+    from src import metrics, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+
+PAGE_URL = 'https://docs.python.org/3/metrics.html'
+
+
+def test_percentile():
+    values = [0.5, 0.1, 0.4, 0.2, 0.3]
+    assert metrics.percentile([], 95) == 0.0
+    assert metrics.percentile(values, 50) == 0.3
+    assert metrics.percentile(values, 95) == 0.5
+    assert metrics.percentile([0.1], 50) == 0.1
+
+
+def test_metrics_summary(tmp_path):
+    recorder = metrics.Metrics()
+    recorder.record_fetch('a', 0.2, False, 100)
+    recorder.record_fetch('b', 0.0, True, 50)
+    with recorder.parsing('a'):
+        pass
+    with recorder.phase(metrics.PHASE_OUTPUT):
+        pass
+    summary = recorder.summary()
+    assert summary['requests'] == 2
+    assert summary['hits'] == 1
+    assert summary['hit_ratio'] == 0.5
+    assert summary['bytes'] == 150
+    assert summary['max'] == 0.2
+    assert summary['network'] == 0.2
+    assert summary['parse'] >= 0
+    assert summary['output'] >= 0
+    path = tmp_path / 'metrics.json'
+    recorder.save(path)
+    saved = json.loads(path.read_text(encoding='utf-8'))
+    assert saved['summary']['requests'] == 2
+    assert [sample['url'] for sample in saved['samples']] == ['a', 'b']
+    assert saved['samples'][0]['bytes'] == 100
+    recorder.reset()
+    assert recorder.summary()['requests'] == 0
+
+
+def test_get_soup_records_metrics(mock_session):
+    recorder = utils.get_metrics()
+    recorder.reset()
+    with requests_mock.Mocker() as mock:
+        mock.get(PAGE_URL, text='<p>metrics</p>')
+        utils.get_soup(mock_session, PAGE_URL)
+        utils.get_soup(mock_session, PAGE_URL)
+    sample = recorder.samples[PAGE_URL]
+    assert sample['from_cache'] is True, (
+        'Повторный запрос должен учитываться как попадание в кеш'
+    )
+    assert sample['bytes'] == len('<p>metrics</p>')
+    assert sample['latency'] >= 0
+    assert sample['parse'] > 0
+    assert recorder.summary()['requests'] == 1
+
+
+def test_mode_metrics(caplog, mock_session):
+    caplog.set_level('INFO')
+    # utils импортирует metrics без пакета src, контекст режима берётся там.
+    mode_metrics = sys.modules[utils.get_metrics.__module__].mode_metrics
+    run_metrics = utils.get_metrics()
+    run_metrics.reset()
+    urls = {
+        mode: [f'{PAGE_URL}?{mode}={page}' for page in 'ab']
+        for mode in ('first', 'second')
+    }
+    mode_recorders = {}
+
+    def run(mode):
+        with mode_metrics(mode) as recorder:
+            mode_recorders[mode] = recorder
+            for _, future in utils.concurrent_map(
+                partial(utils.get_soup, mock_session), urls[mode], workers=2,
+            ):
+                future.result()
+
+    with requests_mock.Mocker() as mock:
+        for url in (*urls['first'], *urls['second']):
+            mock.get(url, text='<p>metrics</p>')
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(run, urls))
+    for mode, recorder in mode_recorders.items():
+        assert sorted(recorder.samples) == urls[mode], (
+            'Замеры одновременных режимов не должны смешиваться'
+        )
+        assert f'Режим {mode}. Запросов: 2' in caplog.text
+    assert run_metrics.summary()['requests'] == 4, (
+        'Общие замеры запуска должны включать все режимы'
+    )
+    assert utils.get_metrics() is run_metrics
@@ -1,4 +1,6 @@
 from datetime import datetime
+import gzip
+import json
 from typing import Optional
 from pathlib import Path
 import pytest
@@ -90,3 +92,75 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+@pytest.mark.parametrize('output_format', [None, 'pretty', 'file'])
+def test_control_output_stream(
+    monkeypatch, tmp_path, capsys, records, output_format,
+):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    rows = records('pep')
+    outputs.control_output(iter(rows), cli_args('pep', output_format))
+    captured_out, _ = capsys.readouterr()
+    if output_format == 'file':
+        (file_path,) = (tmp_path / 'results').iterdir()
+        captured_out = file_path.read_text(encoding='utf-8')
+    assert rows[-1][0] in captured_out, (
+        'Вывод должен принимать строки генератором'
+    )
+
+
+def test_control_output_jsonl(monkeypatch, tmp_path, records):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    rows = records('whats-new')
+    outputs.control_output(iter(rows), cli_args('whats-new', 'jsonl'))
+    (file_path,) = (tmp_path / 'results').iterdir()
+    assert file_path.suffix == '.jsonl'
+    with open(file_path, encoding='utf-8') as file:
+        got = [json.loads(line) for line in file]
+    assert got == [dict(zip(rows[0], row)) for row in rows[1:]]
+
+
+def test_control_output_columnar(monkeypatch, tmp_path, records):
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(outputs, 'find_spec', lambda name: None)
+    monkeypatch.setattr(outputs, 'COLUMNAR_BATCH_SIZE', 5)
+    rows = records('pep')
+    outputs.columnar_output(iter(rows), cli_args('pep', 'columnar'))
+    (file_path,) = (tmp_path / 'results').iterdir()
+    assert file_path.name.endswith('.columns.json.gz')
+    with gzip.open(file_path, 'rt', encoding='utf-8') as file:
+        field_names, *batches = [json.loads(line) for line in file]
+    assert field_names == list(rows[0])
+    assert [
+        tuple(row) for batch in batches for row in zip(*batch)
+    ] == rows[1:]
+
+
+def test_write_parquet_schema(tmp_path):
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    file_path = tmp_path / 'pep.parquet'
+    outputs.write_parquet(
+        ['Статус', 'Количество'],
+        [[('Active', None)], [('Final', 5), (None, 2)]],
+        file_path,
+    )
+    table = pyarrow_parquet.read_table(file_path)
+    assert table.to_pydict() == {
+        'Статус': ['Active', 'Final', None],
+        'Количество': [None, '5', '2'],
+    }
+
+
+def test_control_output_columnar_empty(monkeypatch, tmp_path):
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    outputs.columnar_output(
+        iter([('Статус', 'Количество')]), cli_args('pep', 'columnar'),
+    )
+    (file_path,) = (tmp_path / 'results').iterdir()
+    table = pyarrow_parquet.read_table(file_path)
+    assert table.num_rows == 0
+    assert table.column_names == ['Статус', 'Количество'], (
+        'Результаты без строк должны сохраняться в файл со схемой'
+    )
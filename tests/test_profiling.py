@@ -0,0 +1,90 @@
+from argparse import Namespace
+import pstats
+import sys
+
+import pytest
+
+try:
+    from src import main, profiling
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiling.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `profiling.py`'
+
+
+@pytest.fixture
+def results_dir(monkeypatch, tmp_path):
+    outputs = sys.modules[profiling.get_file_path.__module__]
+    monkeypatch.setattr(outputs, 'BASE_DIR', tmp_path)
+    return tmp_path / 'results'
+
+
+def test_profile_cpu(results_dir, pep_site):
+    main.run_mode(pep_site, Namespace(mode='pep', output=None, profile='cpu'))
+    (stats_path,) = results_dir.glob('pep_*.pstats')
+    functions = {
+        function for _, _, function in pstats.Stats(str(stats_path)).stats
+    }
+    assert 'get_pep_status' in functions, (
+        'Профиль должен включать потоки, в которых загружаются страницы'
+    )
+    (report_path,) = results_dir.glob('pep_*.cpu.txt')
+    assert 'cumulative' in report_path.read_text(encoding='utf-8')
+
+
+def test_profile_mem(results_dir, pep_site):
+    main.run_mode(pep_site, Namespace(mode='pep', output=None, profile='mem'))
+    (report_path,) = results_dir.glob('pep_*.mem.txt')
+    assert report_path.read_text(encoding='utf-8').startswith('Пик памяти')
+    (stacks_path,) = results_dir.glob('pep_*.mem.collapsed')
+    lines = stacks_path.read_text(encoding='utf-8').splitlines()
+    assert lines, 'Collapsed-стеки не должны быть пустыми'
+    for line in lines:
+        stack, size = line.rsplit(' ', 1)
+        assert size.isdigit() and ':' in stack
+
+
+def test_profile_modes_in_turn(results_dir, whats_new_site):
+    main.run_modes(
+        whats_new_site,
+        Namespace(output=None, profile='mem'),
+        ['whats-new', 'cache-stats'],
+    )
+    modes = sorted(
+        path.name.split('_')[0] for path in results_dir.glob('*.mem.txt')
+    )
+    assert modes == ['cache-stats', 'whats-new'], (
+        'Каждый режим должен получить свой отчёт'
+    )
+
+
+def test_without_profile(results_dir):
+    with profiling.profile_mode(Namespace(mode='pep')):
+        pass
+    assert not results_dir.exists()
+
+
+def test_profile_thread_unhooks_when_busy(monkeypatch):
+    profilers = []
+
+    class BusyProfile:
+        def __init__(self):
+            profilers.append(self)
+
+        def enable(self):
+            raise ValueError('Another profiling tool is already active')
+
+    threads_profiler = profiling.ThreadsProfiler()
+    monkeypatch.setattr(profiling.cProfile, 'Profile', BusyProfile)
+    sys.setprofile(threads_profiler.profile_thread)
+    try:
+        threads_profiler.profile_thread()
+        assert sys.getprofile() is None, (
+            'Хук профилировщика должен сниматься, если cProfile занят'
+        )
+        created = len(profilers)
+        sorted([3, 1, 2])
+        assert len(profilers) == created
+    finally:
+        sys.setprofile(None)
+    assert threads_profiler.profilers == []
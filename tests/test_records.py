@@ -0,0 +1,48 @@
+import sys
+
+from bs4 import BeautifulSoup
+import pytest
+
+try:
+    from src import records
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `records.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `records.py`'
+
+URL = 'https://peps.python.org/pep-0008/'
+
+
+def test_pep_record_slots():
+    record = records.PepRecord(8, URL, 'P', ('Active', 'Accepted'))
+    assert not hasattr(record, '__dict__')
+    with pytest.raises(AttributeError):
+        record.title = 'Style Guide'
+
+
+def test_pep_record_shares_strings():
+    soup = BeautifulSoup('<dd><abbr>Active</abbr></dd>', 'lxml')
+    first = records.PepRecord(
+        8, URL, 'P', ['Active', 'Accepted'], soup.abbr.string,
+    )
+    second = records.PepRecord.from_state(first.to_state())
+    second.page_status = ''.join(['Act', 'ive'])
+    assert type(first.page_status) is str, (
+        'Статус не должен держать ссылку на суп через NavigableString'
+    )
+    assert first.page_status is second.page_status
+    assert first.index_status is second.index_status
+    assert first.index_status is records.EXPECTED_STATUS['A']
+    assert first.page_status is sys.intern('Active')
+
+
+def test_pep_record_rows():
+    record = records.PepRecord(8, URL, 'P', ('Active', 'Accepted'), 'Final')
+    assert not record.is_expected()
+    record.page_status = 'Active'
+    assert record.is_expected()
+    assert record.to_row() == (8, URL, 'P', 'Active, Accepted', 'Active')
+    assert len(record.to_row()) == len(records.PEP_FIELD_NAMES)
+    assert records.PepRecord.from_state(record.to_state()) == (
+        records.PepRecord(8, URL, 'P', ('Active', 'Accepted'))
+    )
@@ -0,0 +1,57 @@
+import pytest
+
+try:
+    from src import configs, main, replay
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `replay.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `replay.py`'
+
+from tests.fixture_data import pages
+
+
+@pytest.mark.parametrize('mode, site', [
+    ('whats_new', 'whats_new_site'),
+    ('pep', 'pep_site'),
+])
+def test_record_replay(request, tmp_path, mode, site):
+    session = request.getfixturevalue(site)
+    mode_function = getattr(main, mode)
+    archive = replay.ResponseArchive(tmp_path / 'record')
+    expected = mode_function(replay.RecordingSession(session, archive))
+    assert list(archive.path.glob('*.response.gz')), (
+        'Ответы должны сохраняться в папку записи'
+    )
+    session.requests_mock.reset_mock()
+    got = mode_function(replay.ReplaySession(archive))
+    assert got == expected, 'Воспроизведение должно давать тот же результат'
+    assert not session.requests_mock.called, (
+        'При воспроизведении запросы в сеть не отправляются'
+    )
+
+
+def test_replay_miss(tmp_path, pep_site):
+    archive = replay.ResponseArchive(tmp_path / 'record')
+    main.pep(replay.RecordingSession(pep_site, archive))
+    archive.get_path(pages.pep_link(8)).unlink()
+    with pytest.raises(Exception) as excinfo:
+        main.pep(replay.ReplaySession(archive))
+    assert excinfo.typename == 'ParserReplayException', (
+        'Отсутствующий ответ должен сразу прерывать режим'
+    )
+
+
+def test_configure_session_replay(monkeypatch, tmp_path):
+    monkeypatch.setattr(configs, 'BASE_DIR', tmp_path)
+    parser = configs.configure_argument_parser(['pep'])
+    session = configs.configure_session(parser.parse_args(
+        ['pep', '--cache-backend', 'memory', '--record', str(tmp_path)],
+    ))
+    assert type(session).__name__ == 'RecordingSession'
+    assert session.headers is session.session.headers
+    session = configs.configure_session(
+        parser.parse_args(['pep', '--replay', str(tmp_path)]),
+    )
+    assert type(session).__name__ == 'ReplaySession'
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', '--record', 'a', '--replay', 'b'])
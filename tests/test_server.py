@@ -0,0 +1,111 @@
+from argparse import Namespace
+import json
+from threading import Event, Thread
+from urllib.error import HTTPError
+from urllib.request import ProxyHandler, build_opener
+
+import pytest
+
+try:
+    from src import main, server
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `server.py`'
+
+
+@pytest.fixture
+def results_server():
+    store = server.ResultsStore(['pep', 'whats-new'])
+    http_server = server.make_server(store, '127.0.0.1', 0)
+    Thread(target=http_server.serve_forever, daemon=True).start()
+    yield store, f'http://127.0.0.1:{http_server.server_port}/'
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def get_json(url):
+    """Метод запрашивает url в обход прокси и requests_mock."""
+    try:
+        response = build_opener(ProxyHandler({})).open(url)
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+    return response.status, json.loads(response.read())
+
+
+def test_serve_results(results_server, pep_site):
+    store, url = results_server
+    status, body = get_json(url)
+    assert status == 200
+    assert body == {'modes': {'pep': None, 'whats-new': None}}
+    status, body = get_json(url + 'pep')
+    assert status == 503, 'До первого обновления результатов нет'
+    server.refresh_results(pep_site, Namespace(), {'pep': main.pep}, store)
+    status, body = get_json(url + 'pep')
+    assert status == 200
+    assert body['mode'] == 'pep'
+    assert body['results'][-1] == {'Статус': 'Всего', 'Количество': 12}
+    assert get_json(url)[1]['modes']['pep'] == body['updated']
+    status, body = get_json(url + 'download')
+    assert status == 404
+
+
+@pytest.mark.parametrize('error', [
+    ConnectionError('нет сети'),
+    UnboundLocalError('нет поля Status'),
+])
+def test_refresh_keeps_previous_results(results_server, error):
+    store, url = results_server
+    store.set('pep', [('Статус', 'Количество'), ('Active', 1)])
+
+    def broken_mode(session, cli_args):
+        raise error
+
+    server.refresh_results(None, Namespace(), {'pep': broken_mode}, store)
+    assert get_json(url + 'pep')[1]['results'] == [
+        {'Статус': 'Active', 'Количество': 1},
+    ]
+
+
+def test_refresh_forever_stops():
+    store = server.ResultsStore(['pep'])
+    calls = []
+    stop = Event()
+
+    def mode(session, cli_args):
+        calls.append(cli_args.mode)
+        stop.set()
+        return [('Статус', 'Количество')]
+
+    server.refresh_forever(
+        None, Namespace(refresh_interval=60), {'pep': mode}, store, stop,
+    )
+    assert calls == ['pep']
+
+
+def test_refresh_forever_survives_errors():
+    store = server.ResultsStore(['pep'])
+    calls = []
+    stop = Event()
+
+    def mode(session, cli_args):
+        calls.append(cli_args.mode)
+        if len(calls) == 1:
+            raise KeyError('Status')
+        stop.set()
+        return [('Статус', 'Количество')]
+
+    server.refresh_forever(
+        None, Namespace(refresh_interval=0), {'pep': mode}, store, stop,
+    )
+    assert calls == ['pep', 'pep'], (
+        'После ошибки режима обновления должны продолжаться'
+    )
+
+
+def test_get_served_modes():
+    assert list(main.get_served_modes([])) == [
+        'whats-new', 'latest-versions', 'pep',
+    ]
+    assert list(main.get_served_modes(['pep'])) == ['pep']
+    assert main.get_modes(['serve', 'pep']) == ['pep']
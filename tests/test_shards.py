@@ -0,0 +1,53 @@
+from argparse import Namespace
+
+import pytest
+
+try:
+    from src import main, shards
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+
+
+def test_in_shard():
+    numbers = range(1, 1001)
+    owners = [
+        [index for index in range(1, 5) if shards.in_shard(number, (index, 4))]
+        for number in numbers
+    ]
+    assert all(len(owner) == 1 for owner in owners), (
+        'Каждый PEP должен попадать ровно в один шард'
+    )
+    sizes = [owners.count([index]) for index in range(1, 5)]
+    assert min(sizes) > 200, 'Шарды должны быть примерно равными'
+    assert shards.in_shard(8, (1, 1))
+
+
+@pytest.mark.parametrize('detailed', [False, True])
+def test_merge_matches_single_node(monkeypatch, tmp_path, pep_site, detailed):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    expected = main.pep(pep_site, Namespace(detailed=detailed))
+    partial_rows = 0
+    for index in range(1, 4):
+        partial = main.pep(
+            pep_site, Namespace(shard=(index, 3), detailed=detailed),
+        )
+        partial_rows += len(partial) - 1
+        assert (tmp_path / 'shards' / f'pep_{index}_of_3.json').exists()
+    if detailed:
+        assert partial_rows == len(expected) - 1
+    assert main.merge(pep_site, Namespace(detailed=detailed)) == expected
+
+
+def test_merge_missing_shard(monkeypatch, tmp_path, pep_site):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    main.pep(pep_site, Namespace(shard=(2, 3)))
+    with pytest.raises(Exception) as excinfo:
+        main.merge(pep_site)
+    assert excinfo.typename == 'ParserMergeException'
+    assert '1/3, 3/3' in str(excinfo.value)
+    main.pep(pep_site, Namespace(shard=(1, 2)))
+    with pytest.raises(Exception) as excinfo:
+        main.merge(pep_site)
+    assert excinfo.typename == 'ParserMergeException'
@@ -0,0 +1,48 @@
+from pathlib import Path
+import subprocess
+import sys
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+# Бюджет холодного импорта main с разбором аргументов, в секундах.
+STARTUP_BUDGET = 0.2
+HEAVY_MODULES = (
+    'asyncio', 'bs4', 'lxml', 'prettytable',
+    'requests', 'requests_cache', 'tqdm',
+)
+STARTUP_CODE = (
+    'import main; '
+    'main.configure_argument_parser(main.MODE_TO_FUNCTION.keys())'
+    '.parse_args(["pep"])'
+)
+
+
+def import_times():
+    """Метод возвращает суммарное время импорта модулей из -X importtime."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines()[1:]:
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative) / 1_000_000
+    return times
+
+
+def test_startup_skips_heavy_imports():
+    imported = {name.split('.')[0] for name in import_times()}
+    heavy = sorted(imported.intersection(HEAVY_MODULES))
+    assert not heavy, (
+        f'Модули {heavy} должны импортироваться там, где используются'
+    )
+
+
+def test_startup_budget():
+    startup = min(import_times()['main'] for _ in range(3))
+    assert startup < STARTUP_BUDGET, (
+        f'Импорт main занимает {startup:.3f} с, '
+        f'бюджет {STARTUP_BUDGET} с'
+    )
@@ -0,0 +1,66 @@
+try:
+    from src import storage
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `storage.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `storage.py`'
+
+
+def test_state_roundtrip(tmp_path):
+    path = tmp_path / 'state' / 'pep.json'
+    assert storage.load_state(path) == {}
+    storage.save_state(path, {'peps': {'pep-0008': ['hash', 'Active']}})
+    assert storage.load_state(path) == {
+        'peps': {'pep-0008': ['hash', 'Active']},
+    }
+    path.write_text('{broken', encoding='utf-8')
+    assert storage.load_state(path) == {}
+
+
+def test_parsed_cache_get_or_set(tmp_path):
+    parsed_cache = storage.ParsedCache(tmp_path / 'parsed.sqlite')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return None
+
+    assert parsed_cache.get_or_set('status:1', compute) is None
+    assert parsed_cache.get_or_set('status:1', compute) is None
+    assert len(calls) == 1, 'Значение None тоже должно кешироваться'
+    assert parsed_cache.get_or_set('info:1', lambda: ('h1', 'dl')) == (
+        'h1', 'dl',
+    )
+    assert parsed_cache.get_or_set('info:1', lambda: None) == ['h1', 'dl']
+
+
+def test_parsed_cache_lru(tmp_path):
+    path = tmp_path / 'parsed.sqlite'
+    parsed_cache = storage.ParsedCache(path, max_entries=2)
+    parsed_cache.get_or_set('a', lambda: 'A')
+    parsed_cache.get_or_set('b', lambda: 'B')
+    parsed_cache.get_or_set('a', lambda: 'missed')
+    parsed_cache.get_or_set('c', lambda: 'C')
+    assert parsed_cache.get_or_set('a', lambda: 'missed') == 'A'
+    assert parsed_cache.get_or_set('b', lambda: 'evicted') == 'evicted'
+    parsed_cache.close()
+    assert storage.ParsedCache(path, max_entries=1).size == 1
+
+
+def test_journal(tmp_path):
+    path = tmp_path / 'state' / 'pep.journal.jsonl'
+    journal = storage.Journal(path)
+    journal.add('a', 'Active')
+    journal.add('b', ['h1', 'dl'])
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('["c", "недописанная')
+    journal = storage.Journal(path, resume=True)
+    assert journal.entries == {'a': 'Active', 'b': ['h1', 'dl']}
+    assert journal.split(['a', 'c', 'b']) == (['a', 'b'], ['c'])
+    journal.remove()
+    assert not path.exists()
+    assert storage.Journal(path, resume=True).entries == {}
+    disabled = storage.Journal()
+    disabled.add('a', 'Active')
+    disabled.remove()
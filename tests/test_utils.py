@@ -1,7 +1,13 @@
+import hashlib
+import io
+import time
+import zipfile
+
 import pytest
 import requests
 import requests_mock
 import bs4
+from requests_cache import CachedSession
 from conftest import MAIN_DOC_URL
 try:
     from src import utils
@@ -54,3 +60,129 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+ARCHIVE_URL = MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+
+
+def make_archive():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('docs/library.pdf', b'%PDF' * 50_000)
+    return buffer.getvalue()
+
+
+def ranged_response(content):
+    def _ranged_response(request, context):
+        range_header = request.headers.get('Range')
+        if range_header is None:
+            context.headers['Content-Length'] = str(len(content))
+            return content
+        start = int(range_header[len('bytes='):-1])
+        context.status_code = 206
+        context.headers['Content-Range'] = (
+            f'bytes {start}-{len(content) - 1}/{len(content)}'
+        )
+        return content[start:]
+    return _ranged_response
+
+
+def test_download_file(mock_session, tmp_path):
+    content = make_archive()
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=ranged_response(content))
+        got = utils.download_file(
+            mock_session,
+            ARCHIVE_URL,
+            tmp_path / 'docs.zip',
+            chunk_size=1024,
+            check=utils.check_archive,
+        )
+    assert (tmp_path / 'docs.zip').read_bytes() == content
+    assert got == hashlib.sha256(content).hexdigest()
+    assert not (tmp_path / 'docs.zip.part').exists()
+    assert not mock_session.cache.contains(url=ARCHIVE_URL), (
+        'Архив не должен сохраняться в кеш ответов'
+    )
+
+
+def test_download_file_resume(mock_session, tmp_path):
+    content = make_archive()
+    (tmp_path / 'docs.zip.part').write_bytes(content[:1000])
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=ranged_response(content))
+        got = utils.download_file(
+            mock_session, ARCHIVE_URL, tmp_path / 'docs.zip',
+        )
+        assert mock.last_request.headers['Range'] == 'bytes=1000-'
+        assert mock.last_request.headers['Accept-Encoding'] == 'identity', (
+            'Архив должен загружаться без сжатия, чтобы Range совпадал '
+            'с размером части на диске'
+        )
+    assert (tmp_path / 'docs.zip').read_bytes() == content
+    assert got == hashlib.sha256(content).hexdigest()
+
+
+def test_download_file_broken_archive(mock_session, tmp_path):
+    content = make_archive()
+    broken = content[:100] + b'\0' * 100 + content[200:]
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=broken)
+        with pytest.raises(BaseException) as excinfo:
+            utils.download_file(
+                mock_session,
+                ARCHIVE_URL,
+                tmp_path / 'docs.zip',
+                check=utils.check_archive,
+            )
+    assert excinfo.typename == 'ParserDownloadException'
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_get_soup_parse_only(pep_site):
+    got = utils.get_soup(
+        pep_site,
+        'https://peps.python.org/pep-0008/',
+        parse_only={'name': 'dl'},
+    )
+    assert [tag.name for tag in got.contents] == ['dl']
+    assert got.find('p') is None
+    assert len(got.find_all('dt')) == 3
+
+
+def test_get_response_revalidate():
+    session = CachedSession(backend='memory', always_revalidate=True)
+    url = 'https://peps.python.org/pep-0008/'
+
+    def conditional_page(request, context):
+        if request.headers.get('If-None-Match') == '"v1"':
+            context.status_code = 304
+            return ''
+        context.headers['ETag'] = '"v1"'
+        return 'PEP 8'
+
+    utils.RESPONSE_COUNTS.clear()
+    with requests_mock.Mocker() as mock:
+        mock.get(url, text=conditional_page)
+        first = utils.get_response(session, url)
+        second = utils.get_response(session, url)
+        assert mock.last_request.headers['If-None-Match'] == '"v1"'
+    assert first.text == second.text == 'PEP 8'
+    assert utils.RESPONSE_COUNTS == {'downloaded': 1, 'revalidated': 1}
+
+
+def test_concurrent_map_close_cancels_queued():
+    started = []
+
+    def work(item):
+        started.append(item)
+        time.sleep(0.05)
+        return item
+
+    pairs = utils.concurrent_map(work, range(20), workers=2)
+    item, future = next(pairs)
+    assert future.result() == item == 0
+    pairs.close()
+    assert len(started) <= 4, (
+        'Задачи из очереди должны отменяться при раннем закрытии'
+    )